@@ -0,0 +1,67 @@
+import tkinter as tk
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+
+class BackgroundFrame(tk.Frame):
+    INTERIM_DELAY = 16  # ms, at most one fast redraw per frame while resizing
+    SETTLE_DELAY = 150  # ms without <Configure> before the high-quality redraw
+    CACHE_SIZE = 4  # recently rendered sizes kept as PhotoImages
+
+    def __init__(self, master, image_path):
+        super().__init__(master)
+        self.image = Image.open(image_path)
+        self.img_copy = self.image.copy()
+        self.background_image = ImageTk.PhotoImage(self.image)
+        self.background_label = tk.Label(self, image=self.background_image)
+        self.background_label.place(x=0, y=0, relwidth=1, relheight=1)
+        self.background_label.bind('<Configure>', self.resize_image)
+        self.rendered = OrderedDict()
+        self.target_size = None
+        self.interim_job = None
+        self.settle_job = None
+
+    def resize_image(self, event):
+        # A window drag fires dozens of these a second: only remember the size
+        # and let the timers below do the work
+        new_size = (max(event.width, 1), max(event.height, 1))
+        if new_size == self.target_size:
+            return
+        self.target_size = new_size
+
+        if new_size in self.rendered:
+            self.show_rendered(new_size)
+            return
+        if self.interim_job is None:
+            self.interim_job = self.after(self.INTERIM_DELAY, self.interim_resize)
+        if self.settle_job is not None:
+            self.after_cancel(self.settle_job)
+        self.settle_job = self.after(self.SETTLE_DELAY, self.final_resize)
+
+    def show_rendered(self, size):
+        self.rendered.move_to_end(size)
+        self.background_image = self.rendered[size]
+        self.background_label.configure(image=self.background_image)
+        for job in (self.interim_job, self.settle_job):
+            if job is not None:
+                self.after_cancel(job)
+        self.interim_job = self.settle_job = None
+
+    def interim_resize(self):
+        self.interim_job = None
+        self.image = self.img_copy.resize(self.target_size, Image.NEAREST)
+        self.background_image = ImageTk.PhotoImage(self.image)
+        self.background_label.configure(image=self.background_image)
+
+    def final_resize(self):
+        self.settle_job = None
+        if self.interim_job is not None:
+            self.after_cancel(self.interim_job)
+            self.interim_job = None
+        size = self.target_size
+        self.image = self.img_copy.resize(size, Image.LANCZOS)
+        self.rendered[size] = ImageTk.PhotoImage(self.image)
+        if len(self.rendered) > self.CACHE_SIZE:
+            self.rendered.popitem(last=False)
+        self.show_rendered(size)
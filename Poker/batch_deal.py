@@ -0,0 +1,54 @@
+import numpy as np
+
+from batch_eval import evaluate_hands_batch
+
+# Deal many hands at once as NumPy arrays, for simulations that would
+# otherwise spend their time drawing cards one hand at a time in Python.
+#
+# Each row is one independently shuffled deck (argsort of a row of uniform
+# floats), laid out the way PokerGame.new_hand deals it: seat i gets cards
+# 2i and 2i + 1, the next five are the flop, turn and river. The arrays go
+# straight into batch_eval.evaluate_hands_batch.
+
+CHUNK_HANDS = 1 << 16  # hands per pass in simulate_showdowns, bounds the temporaries
+
+
+def shuffle_decks(num_decks, rng, depth=52):
+    # (num_decks, depth) card indices: the top `depth` cards of num_decks shuffled decks
+    return np.argsort(rng.random((num_decks, 52)), axis=1)[:, :depth]
+
+
+def deal_batch(num_hands, num_players, rng=None):
+    # -> hole cards (num_hands, num_players, 2) and boards (num_hands, 5).
+    # rng is a numpy Generator, e.g. dealer.Dealer(seed).generator(n).
+    if not 2 <= num_players <= 9:
+        raise ValueError("num_players must be between 2 and 9")
+    if rng is None:
+        rng = np.random.default_rng()
+    decks = shuffle_decks(num_hands, rng, 2 * num_players + 5)
+    hole = decks[:, :2 * num_players].reshape(num_hands, num_players, 2)
+    board = decks[:, 2 * num_players:]
+    return hole, board
+
+
+def showdown_batch(hole, board):
+    # (K, P, 2) hole cards and (K, 5) boards -> strengths (K, P) and a (K, P)
+    # mask of the seats holding the best hand (several when the pot is split)
+    num_hands, num_players, _ = hole.shape
+    boards = np.broadcast_to(board[:, None, :], (num_hands, num_players, board.shape[1]))
+    cards = np.concatenate([hole, boards], axis=2).reshape(num_hands * num_players, -1)
+    strengths = evaluate_hands_batch(cards)[0].reshape(num_hands, num_players)
+    winners = strengths == strengths.max(axis=1, keepdims=True)
+    return strengths, winners
+
+
+def simulate_showdowns(num_hands, num_players, rng=None, chunk_hands=CHUNK_HANDS):
+    # Share of the pots won by each seat over num_hands random showdowns
+    if rng is None:
+        rng = np.random.default_rng()
+    shares = np.zeros(num_players)
+    for start in range(0, num_hands, chunk_hands):
+        hole, board = deal_batch(min(chunk_hands, num_hands - start), num_players, rng)
+        _, winners = showdown_batch(hole, board)
+        shares += (winners / winners.sum(axis=1, keepdims=True)).sum(axis=0)
+    return shares / num_hands
@@ -0,0 +1,65 @@
+import numpy as np
+
+from evaluator import (CARD_RANK_BITS, CARD_WEIGHTS, CATEGORY_NAMES, CATEGORY_SHIFT, FLUSH_FLAGS, FLUSH_PROBE,
+                       FLUSH_TABLE, RANK_KEY_MASK, SUIT_SHIFT, fill_rank_table)
+
+# Vectorized companion to evaluator.evaluate_indices: the same weights and
+# tables, applied to a whole (N, k) array of card indices at once. The rank
+# table dict becomes two sorted arrays so lookups are one searchsorted call.
+
+CHUNK_SIZE = 1 << 20  # rows per pass, bounds the temporaries for huge inputs
+
+_WEIGHTS = np.array(CARD_WEIGHTS, dtype=np.int64)
+_RANK_BITS = np.array(CARD_RANK_BITS, dtype=np.int64)
+_SUITS = np.arange(52, dtype=np.int64) & 3
+_FLUSH_TABLE = np.array(FLUSH_TABLE, dtype=np.int64)
+
+_rank_items = sorted(fill_rank_table().items())
+_RANK_KEYS = np.array([key for key, _ in _rank_items], dtype=np.int64)
+_RANK_STRENGTHS = np.array([strength for _, strength in _rank_items], dtype=np.int64)
+del _rank_items
+
+# Evaluator category -> index in PokerGame.HAND_RANKINGS (best hand first)
+_RANKING_INDEX = np.array([len(CATEGORY_NAMES) - 1 - category for category in range(len(CATEGORY_NAMES))],
+                          dtype=np.int8)
+
+
+def cards_to_array(hands):
+    # List of Card lists (all the same length) -> (N, k) index array
+    return np.array([[card.index for card in hand] for hand in hands], dtype=np.int64)
+
+
+def _evaluate_chunk(cards):
+    key = _WEIGHTS[cards].sum(axis=1)
+    suit_counts = key >> SUIT_SHIFT
+    is_flush = ((suit_counts + FLUSH_PROBE) & FLUSH_FLAGS) != 0
+
+    rank_keys = key & RANK_KEY_MASK
+    strengths = _RANK_STRENGTHS[np.searchsorted(_RANK_KEYS, rank_keys)]
+
+    if is_flush.any():
+        flush_cards = cards[is_flush]
+        flush_counts = suit_counts[is_flush]
+        per_suit = np.stack([(flush_counts >> (4 * suit)) & 0xF for suit in range(4)], axis=1)
+        flush_suit = per_suit.argmax(axis=1)
+        in_suit = _SUITS[flush_cards] == flush_suit[:, None]
+        masks = (_RANK_BITS[flush_cards] * in_suit).sum(axis=1)
+        strengths[is_flush] = _FLUSH_TABLE[masks]
+
+    return strengths
+
+
+def evaluate_hands_batch(cards_array, chunk_size=CHUNK_SIZE):
+    # (N, k) card indices, k <= 7 -> (strengths, categories), both shape (N,).
+    # Strengths match evaluator.evaluate_indices row for row; categories are
+    # indices into PokerGame.HAND_RANKINGS.
+    cards = np.asarray(cards_array, dtype=np.int64)
+    if cards.ndim != 2 or cards.shape[1] > 7:
+        raise ValueError("cards_array must have shape (N, k) with k <= 7")
+
+    strengths = np.empty(len(cards), dtype=np.int64)
+    for start in range(0, len(cards), chunk_size):
+        strengths[start:start + chunk_size] = _evaluate_chunk(cards[start:start + chunk_size])
+
+    categories = _RANKING_INDEX[strengths >> CATEGORY_SHIFT]
+    return strengths, categories
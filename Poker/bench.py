@@ -0,0 +1,363 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+import new_texas
+from cards import Deck
+from headless import create_game
+
+# Benchmarks for the engine and GUI hot paths.
+#
+#   python bench.py                        run everything and print a table
+#   python bench.py --save base.json       ... and store the results
+#   python bench.py --compare base.json    ... and compare against a stored run
+#
+# Every benchmark times `samples` batches of `batch` calls, each call on its
+# own; ops/s is the overall rate and the percentiles are taken over the single
+# calls, divided by the operations per call. The determine_winner and GUI
+# benchmarks do one operation per call, so theirs are true per-call latencies.
+# Memory is the tracemalloc peak of one extra batch. The GUI benchmarks drive
+# the real PokerGameGUI methods against a stand-in for tkinter, so they measure
+# our own Python work and widget churn rather than Tk itself.
+#
+# A full run also times a cold `import new_texas` in a fresh interpreter and
+# fails if it goes over IMPORT_BUDGET or pulls in tkinter/PIL.
+
+SEED = 1234
+REGRESSION_THRESHOLD = 0.10  # flag benchmarks that got more than 10% slower
+IMPORT_BUDGET = 0.060  # seconds for the engine import, best of IMPORT_RUNS
+IMPORT_RUNS = 5
+GUI_MODULES = ('tkinter', 'PIL')
+
+
+class FakeWidget:
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = options
+        self.children = []
+        self.items = {}
+        if isinstance(master, FakeWidget):
+            master.children.append(self)
+
+    def pack(self, **options):
+        pass
+
+    def pack_forget(self):
+        pass
+
+    def grid(self, **options):
+        pass
+
+    def grid_remove(self):
+        pass
+
+    def destroy(self):
+        if isinstance(self.master, FakeWidget) and self in self.master.children:
+            self.master.children.remove(self)
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def config(self, **options):
+        self.options.update(options)
+
+    configure = config
+
+    def create_image(self, x, y, **options):
+        item = len(self.items) + 1
+        while item in self.items:
+            item += 1
+        self.items[item] = [(x, y), options]
+        return item
+
+    def coords(self, item, *xy):
+        self.items[item][0] = xy
+
+    def itemconfig(self, item, **options):
+        self.items[item][1].update(options)
+
+    def delete(self, item):
+        if item == "all":
+            self.items.clear()
+        else:
+            self.items.pop(item, None)
+
+
+class FakeTk:
+    Frame = Label = Canvas = Button = Entry = FakeWidget
+    LEFT, RIGHT, TOP, BOTTOM, NW = 'left', 'right', 'top', 'bottom', 'nw'
+    NORMAL, DISABLED, HIDDEN, END = 'normal', 'disabled', 'hidden', 'end'
+
+
+class FakeSprites(dict):
+    def stack(self, name, count, step):
+        return self[name]
+
+
+def random_hands(count, size, rng):
+    deck = Deck(rng)
+    hands = []
+    for _ in range(count):
+        deck.reset()
+        hands.append(deck.draw_cards(size))
+    return hands
+
+
+def dealt_game(num_players, rng):
+    game = create_game(num_players)
+    game.deck = Deck(rng)
+    game.new_hand()
+    game.deal_community_cards(5)
+    return game
+
+
+def fake_gui(game):
+    gui = object.__new__(new_texas.PokerGameGUI)
+    gui.game = gui.view = game
+    gui.engine = None
+    gui.player_hand_frame = FakeWidget()
+    gui.community_frame = FakeWidget()
+    gui.player_tokens_frame = FakeWidget()
+    gui.canvas = FakeWidget(gui.player_tokens_frame)
+    gui.card_images = {f"{face}_of_{suit}": object()
+                       for suit in new_texas.PokerGameGUI.SUIT_MAPPING.values() for face in new_texas.Card.FACES}
+    gui.token_images = FakeSprites((value, object()) for value in ('5', '10', '50', '100', '500', '1000'))
+    gui.chip_items = []
+    gui.shown_chip_layout = None
+    gui.create_card_slots()
+    return gui
+
+
+def bench_card_int(rng):
+    cards = [card for hand in random_hands(8, 7, rng) for card in hand]
+    def run():
+        for card in cards:
+            int(card)
+    return run, len(cards)
+
+
+def bench_deck_construction(rng):
+    def run():
+        Deck()
+    return run, 1
+
+
+def bench_draw_cards(rng):
+    deck = Deck(rng)
+    def run():
+        deck.reset()
+        deck.draw_cards(2)
+        deck.draw_cards(2)
+        deck.draw_cards(3)
+        deck.draw_cards(1)
+        deck.draw_cards(1)
+    return run, 5
+
+
+def bench_evaluate_hand(rng):
+    game = new_texas.PokerGame()
+    hands = random_hands(1000, 7, rng)
+    def run():
+        for hand in hands:
+            game.evaluate_hand(hand[:2], hand[2:])
+    return run, len(hands)
+
+
+def bench_determine_winner(num_players):
+    def setup(rng):
+        # One showdown per call, cycling over 50 deals. The payout is undone after
+        # each call so stacks stay put; winners only gain chips, so setting _money
+        # directly cannot change which seats are active.
+        games = itertools.cycle([(game, [player.money for player in game.players])
+                                 for game in (dealt_game(num_players, rng) for _ in range(50))])
+        def run():
+            game, stacks = next(games)
+            game.determine_winner()
+            for player, money in zip(game.players, stacks):
+                player._money = money
+        return run, 1
+    return setup
+
+
+def bench_batch_showdown(num_players):
+    # Vectorized deal + showdown, per hand; compare with determine_winner_<n>p
+    def setup(rng):
+        import numpy as np
+        from batch_deal import deal_batch, showdown_batch
+        generator = np.random.default_rng(SEED)
+        def run():
+            showdown_batch(*deal_batch(1000, num_players, generator))
+        return run, 1000
+    return setup
+
+
+def bench_update_hand_display(rng):
+    # Alternates between two deals so every call has changed cards to show
+    games = [dealt_game(9, rng), dealt_game(9, rng)]
+    gui = fake_gui(games[0])
+    games = itertools.cycle(games)
+    def run():
+        gui.game = gui.view = next(games)
+        gui.update_hand_display()
+    return run, 1
+
+
+def bench_update_tokens_display(rng):
+    # Alternates between two stacks so every call has a new layout to draw
+    game = dealt_game(9, rng)
+    gui = fake_gui(game)
+    stacks = itertools.cycle((4785, 23415))
+    def run():
+        game.players[0]['money'] = next(stacks)
+        gui.update_tokens_display()
+    return run, 1
+
+
+BENCHMARKS = {
+    'card_int': bench_card_int,
+    'deck_construction': bench_deck_construction,
+    'deck_draw_cards': bench_draw_cards,
+    'evaluate_hand': bench_evaluate_hand,
+    'update_hand_display': bench_update_hand_display,
+    'update_tokens_display': bench_update_tokens_display,
+}
+BENCHMARKS.update({f'determine_winner_{n}p': bench_determine_winner(n) for n in range(2, 10)})
+BENCHMARKS.update({f'batch_showdown_{n}p': bench_batch_showdown(n) for n in (2, 9)})
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def run_benchmark(setup, samples, min_time):
+    rng = random.Random(SEED)
+    with mock.patch.object(new_texas, 'tk', FakeTk), mock.patch('builtins.print'):
+        run, ops_per_call = setup(rng)
+
+        # Calibrate calls per batch so one batch takes at least min_time
+        batch = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(batch):
+                run()
+            if time.perf_counter() - start >= min_time or batch >= 1 << 20:
+                break
+            batch *= 2
+
+        # Every call is timed on its own, so the percentiles keep the tail
+        per_op = []
+        total = 0.0
+        clock = time.perf_counter
+        for _ in range(samples * batch):
+            start = clock()
+            run()
+            elapsed = clock() - start
+            total += elapsed
+            per_op.append(elapsed / ops_per_call)
+
+        tracemalloc.start()
+        for _ in range(batch):
+            run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    per_op.sort()
+    return {
+        'ops_per_sec': len(per_op) * ops_per_call / total,
+        'p50_us': percentile(per_op, 0.50) * 1e6,
+        'p90_us': percentile(per_op, 0.90) * 1e6,
+        'p99_us': percentile(per_op, 0.99) * 1e6,
+        'peak_kib': peak / 1024,
+    }
+
+
+def import_time(module):
+    # Best cold import time of module over IMPORT_RUNS fresh interpreters, and
+    # whether the import loaded any of GUI_MODULES
+    code = (f"import sys, time; start = time.perf_counter(); import {module}; "
+            f"print(time.perf_counter() - start, any(name in sys.modules for name in {GUI_MODULES!r}))")
+    best = None
+    for _ in range(IMPORT_RUNS):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+        elapsed = float(output[0])
+        best = elapsed if best is None else min(best, elapsed)
+    return best, output[1] == 'True'
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the poker engine and GUI hot paths")
+    parser.add_argument('names', nargs='*', help="benchmarks to run (default: all)")
+    parser.add_argument('--samples', type=int, default=20)
+    parser.add_argument('--min-time', type=float, default=0.01, help="seconds per timed batch")
+    parser.add_argument('--save', metavar='PATH', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a JSON baseline")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<26}{'ops/s':>14}{'p50 us':>10}{'p90 us':>10}{'p99 us':>10}{'peak KiB':>10}")
+    for name in args.names or BENCHMARKS:
+        try:
+            result = results[name] = run_benchmark(BENCHMARKS[name], args.samples, args.min_time)
+        except Exception as error:  # a broken code path should not hide the other numbers
+            print(f"{name:<26}  failed: {error!r}")
+            continue
+        line = (f"{name:<26}{result['ops_per_sec']:>14,.0f}{result['p50_us']:>10.2f}"
+                f"{result['p90_us']:>10.2f}{result['p99_us']:>10.2f}{result['peak_kib']:>10.1f}")
+        if baseline and name in baseline:
+            ratio = result['ops_per_sec'] / baseline[name]['ops_per_sec']
+            line += f"   x{ratio:.2f} vs baseline"
+            if ratio < 1 - REGRESSION_THRESHOLD:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    import_seconds = None
+    if not args.names:
+        import_seconds, loads_gui = import_time('new_texas')
+        line = f"{'import new_texas':<26}{import_seconds * 1000:>11.1f} ms   budget {IMPORT_BUDGET * 1000:.0f} ms"
+        if import_seconds > IMPORT_BUDGET:
+            regressions.append('import')
+            line += "  OVER BUDGET"
+        if loads_gui:
+            regressions.append('import')
+            line += "  LOADS TK/PIL"
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'revision': git_revision(), 'python': platform.python_version(),
+                       'machine': platform.machine(), 'seed': SEED, 'results': results,
+                       'import_seconds': import_seconds}, f, indent=2)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+import random
+
+# Compact card encoding.
+#
+# There are exactly 52 Card objects: Card(suit, face) always hands back the same
+# interned instance, so cards compare and hash by identity and never touch
+# their strings after construction. Each card carries
+#   index  0-51, laid out as rank * 4 + suit (rank 0 = deuce ... 12 = ace,
+#          suit in Card.SUITS order)
+#   bits   Cactus Kev style word: rank bit (16-28) | suit bit (12-15) |
+#          rank (8-11) | rank prime (0-5)
+#   mask   1 << index, so a hand or board fits in one 64-bit int
+
+RANK_FACES = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+RANK_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+SUIT_GLYPHS = tuple(map(chr, (9824, 9827, 9829, 9830)))  # ♠ ♣ ♥ ♦
+FULL_MASK = (1 << 52) - 1
+
+
+class Card:
+    ACE, JACK, QUEEN, KING = 'A', 'J', 'Q', 'K'
+    FACES = (ACE, '2', '3', '4', '5', '6', '7', '8', '9', '10', JACK, QUEEN, KING)
+    SUITS = SUIT_GLYPHS
+    SPADE, CLUB, HEART, DIAMOND = SUITS  # ♠ ♣ ♥ ♦
+
+    __slots__ = ('_suit', '_face', '_value', 'index', 'rank', 'suit', 'bits', 'mask')
+    _interned = {}
+
+    def __new__(cls, suit, face):
+        card = cls._interned.get((suit, face))
+        if card is not None:
+            return card
+        if suit not in SUIT_GLYPHS or face not in RANK_FACES:
+            raise ValueError(f"Unknown card: {face!r} of {suit!r}")
+
+        card = super().__new__(cls)
+        card._suit = suit
+        card._face = face
+        card.rank = RANK_FACES.index(face)
+        card.suit = SUIT_GLYPHS.index(suit)
+        card.index = card.rank * 4 + card.suit
+        card.bits = (1 << (16 + card.rank)) | (1 << (12 + card.suit)) | (card.rank << 8) | RANK_PRIMES[card.rank]
+        card.mask = 1 << card.index
+        card._value = 1 if face == Card.ACE else card.rank + 2
+        cls._interned[suit, face] = card
+        return card
+
+    def __int__(self):
+        return self._value
+
+    def __str__(self):
+        return self._suit + str(self._face)
+
+    def __repr__(self):
+        return __class__.__name__ + repr((self._suit, self._face))
+
+    def __reduce__(self):
+        # Unpickles to the interned instance (worker processes get singletons too)
+        return Card, (self._suit, self._face)
+
+    @staticmethod
+    def from_index(index):
+        return CARDS[index]
+
+
+# All 52 cards by index, and in the order Deck has always been built in
+CARDS = tuple(Card(SUIT_GLYPHS[index & 3], RANK_FACES[index >> 2]) for index in range(52))
+DECK_ORDER = tuple(Card(suit, face) for suit in Card.SUITS for face in Card.FACES)
+
+
+def cards_to_mask(cards):
+    mask = 0
+    for card in cards:
+        mask |= card.mask
+    return mask
+
+
+def mask_to_indices(mask):
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
+
+
+def mask_to_cards(mask):
+    return [CARDS[index] for index in mask_to_indices(mask)]
+
+
+class Deck:
+    # Cards live in one fixed list split by two positions:
+    #   [0, cursor)   dealt this hand
+    #   [cursor, end) still in the deck
+    #   [end, 52)     dead cards taken out with remove()
+    # Drawing is an on-demand Fisher-Yates step (swap a random live card to the
+    # cursor and advance it), so a draw is O(1) and nothing is reallocated
+    # between hands: reset() and rewind() only move the positions back.
+    def __init__(self, rng=None):
+        self._deck = list(DECK_ORDER)
+        self._cursor = 0
+        self._end = 52
+        self._rng = rng or random  # anything with random() and shuffle(), e.g. random.Random(seed)
+
+    def show(self):
+        return self._deck[self._cursor:self._end]
+
+    def shuffle(self):
+        live = self._deck[self._cursor:self._end]
+        self._rng.shuffle(live)
+        self._deck[self._cursor:self._end] = live
+
+    def __iter__(self):
+        return iter(self.show())
+
+    def __len__(self):
+        return self._end - self._cursor
+
+    def draw_cards(self, num_cards=1):
+        cursor = self._cursor
+        end = cursor + num_cards
+        if end > self._end:
+            raise ValueError("Not enough cards in the deck")
+
+        deck = self._deck
+        live = self._end - cursor
+        rand = self._rng.random
+        for i in range(cursor, end):
+            j = i + int(rand() * live)
+            deck[i], deck[j] = deck[j], deck[i]
+            live -= 1
+        self._cursor = end
+
+        return deck[cursor:end]
+
+    def remove(self, cards):
+        # Take known cards (e.g. hole cards and board in an equity rollout) out of
+        # play until the next reset()
+        deck = self._deck
+        for card in cards:
+            try:
+                i = deck.index(card, self._cursor, self._end)
+            except ValueError:
+                raise ValueError(f"{card} is not in the deck") from None
+            self._end -= 1
+            deck[i], deck[self._end] = deck[self._end], deck[i]
+
+    def rewind(self):
+        # Put the dealt cards back, keeping removed cards out
+        self._cursor = 0
+
+    def reset(self, reorder=False):
+        # Full 52-card deck again, ready for a new hand. reorder also puts the
+        # cards back in DECK_ORDER, so the next deal depends only on the rng
+        # and not on earlier hands (replaying a seeded hand needs that).
+        self._cursor = 0
+        self._end = 52
+        if reorder:
+            self._deck[:] = DECK_ORDER
+
+    def create_deck():
+        return list(DECK_ORDER)
@@ -0,0 +1,264 @@
+import argparse
+import random
+import sys
+from itertools import combinations
+
+import evaluator
+from cards import DECK_ORDER, Card
+from headless import create_game, play_hand, scripted_player
+
+# Regression checks for the engine: each check raises AssertionError on
+# failure. Run from this directory with `python checks.py [names]`; the exit
+# status is the number of failed checks.
+
+
+def check_seeded_replay():
+    # A seeded hand deals the same cards whatever was dealt before it
+    fresh = create_game(3, seed=7)
+    fresh.new_hand(5)
+    played = create_game(3, seed=7)
+    for _ in range(3):
+        play_hand(played)  # hands 1 to 3
+    played.new_hand(5)
+    for game in (fresh, played):
+        game.deal_community_cards(5)
+    for a, b in zip(fresh.players, played.players):
+        assert a.hand == b.hand, (a.hand, b.hand)
+    assert fresh.community_cards == played.community_cards
+
+
+def _cards(text):
+    # '10s Ah' -> [Card('♠', '10'), Card('♥', 'A')]
+    suits = {'c': '♣', 'd': '♦', 'h': '♥', 's': '♠'}
+    return [Card(suits[card[-1]], card[:-1]) for card in text.split()]
+
+
+def _settle(board, seats):
+    # Showdown over board for seats of (hole cards or None if folded, chips put
+    # in); every stack starts empty, so the final stacks are the winnings
+    game = create_game(len(seats))
+    game.community_cards = _cards(board)
+    game.in_hand = set()
+    for player, (hole, contributed) in zip(game.players, seats):
+        player.hand = _cards(hole or '')
+        player.contributed = contributed
+        player.money = 0
+        if hole:
+            game.in_hand.add(player.seat)
+    game.pot = sum(contributed for _, contributed in seats)
+    game.determine_winner()
+    return [player.money for player in game.players]
+
+
+def _brute_force_pots(game):
+    # side_pots() the slow way: peel off the smallest contender stake each time
+    left = {player.seat: player.contributed for player in game.players}
+    pots = []
+    while any(left[seat] for seat in game.in_hand):
+        level = min(left[seat] for seat in game.in_hand if left[seat])
+        pots.append((sum(min(chips, level) for chips in left.values()),
+                     sorted(seat for seat in game.in_hand if left[seat] >= level)))
+        left = {seat: chips - min(chips, level) for seat, chips in left.items()}
+    if pots and any(left.values()):
+        pots[-1] = (pots[-1][0] + sum(left.values()), pots[-1][1])
+    return pots
+
+
+def check_side_pots_brute_force(cases=2000):
+    rng = random.Random(25)
+    for _ in range(cases):
+        game = create_game(rng.randint(2, 9))
+        for player in game.players:
+            player.contributed = rng.choice((0, 10, 20, 50, 50, 100, 300, 500))
+        game.in_hand = {player.seat for player in game.players if player.contributed and rng.random() < 0.7}
+        if not game.in_hand:
+            game.players[0].contributed = 500
+            game.in_hand = {0}
+        pots = [(amount, sorted(eligible)) for amount, eligible in game.side_pots()]
+        assert pots == _brute_force_pots(game), (pots, _brute_force_pots(game))
+
+
+def check_all_in_side_pot():
+    # The short all-in stack wins the main pot only; the side pot goes to the
+    # best of the players who covered it
+    board = '2c 7d 9h Js Kc'
+    assert _settle(board, [('As Ah', 100), ('Kd Qd', 300), ('3h 4h', 300)]) == [300, 400, 0]
+
+
+def check_folded_chips():
+    # Folded chips are won but never make their seat eligible
+    board = '2c 7d 9h Js Kc'
+    assert _settle(board, [('3h 4h', 100), ('As Ah', 300), (None, 200)]) == [0, 600, 0]
+    assert _settle(board, [('As Ah', 100), ('3h 4h', 300), (None, 200)]) == [300, 300, 0]
+
+
+def check_odd_chip():
+    # The board plays for everyone: 45 chips split two ways, the odd one to the earlier seat
+    board = 'As Ks Qd Jc 10h'
+    assert _settle(board, [('2c 3d', 20), ('2d 3c', 20), (None, 5)]) == [23, 22, 0]
+
+
+def check_chip_conservation(hands=300):
+    # Seeded sessions at every table size: whole chips only, none created or lost
+    for num_players in range(2, 10):
+        game = create_game(num_players, seed=num_players)
+        for _ in range(hands):
+            if sum(player.money > 0 for player in game.players) < 2:
+                for player in game.players:
+                    player.money = 500
+            total = sum(player.money for player in game.players)
+            play_hand(game)
+            assert all(type(player.money) is int for player in game.players)
+            assert sum(player.money for player in game.players) == total
+
+
+def check_single_funded_seat():
+    # One stack left: no hand is dealt, the table reports the game as over
+    game = create_game(2, scripted_player(['fold']))
+    game.players[1].money = 0
+    events = []
+    game.add_listener(lambda event, data: events.append((event, data)))
+    assert game.new_hand() is False
+    assert events == [('game_over', {'winner': 'Player1'})]
+    game.in_hand = set()
+    assert game.determine_winner()[0] == 'Nobody'
+
+
+def check_blinds_cover_every_stack():
+    # Nobody can act after the blinds: the board is run out and the showdown is next
+    game = create_game(2)
+    game.small_blind, game.big_blind = 500, 1000
+    assert game.new_hand()
+    assert game.round == 6 and len(game.community_cards) == 5 and not game.pending
+    game.step()
+    assert sum(player.money for player in game.players) == 1000
+
+
+def _reference_five(cards):
+    # (category, tie-break ranks) of exactly five cards, straight from the rules
+    ranks = sorted((card.index >> 2 for card in cards), reverse=True)
+    flush = len({card.index & 3 for card in cards}) == 1
+    groups = sorted(((ranks.count(rank), rank) for rank in set(ranks)), reverse=True)
+    shape = [count for count, _ in groups]
+    order = tuple(rank for _, rank in groups)
+    top = None
+    if len(groups) == 5:
+        if ranks[0] - ranks[4] == 4:
+            top = ranks[0]
+        elif ranks == [12, 3, 2, 1, 0]:  # the wheel, five high
+            top = 3
+    if top is not None and flush:
+        return (evaluator.ROYAL_FLUSH if top == 12 else evaluator.STRAIGHT_FLUSH, (top,))
+    if shape == [4, 1]:
+        return (evaluator.FOUR_OF_A_KIND, order)
+    if shape == [3, 2]:
+        return (evaluator.FULL_HOUSE, order)
+    if flush:
+        return (evaluator.FLUSH, order)
+    if top is not None:
+        return (evaluator.STRAIGHT, (top,))
+    category = {(3, 1, 1): evaluator.THREE_OF_A_KIND, (2, 2, 1): evaluator.TWO_PAIRS,
+                (2, 1, 1, 1): evaluator.ONE_PAIR}.get(tuple(shape), evaluator.HIGH_CARD)
+    return (category, order)
+
+
+def _reference(cards):
+    # Best five of five to seven cards
+    return max(_reference_five(five) for five in combinations(cards, 5))
+
+
+def check_evaluator(hands=3000):
+    # evaluate() against the brute-force best-of-C(n, 5) reference: same category
+    # for every hand, and the same order (ties included) over all of them
+    rng = random.Random(1)
+    rated = []
+    for _ in range(hands):
+        cards = rng.sample(DECK_ORDER, rng.randint(5, 7))
+        strength = evaluator.evaluate(cards)
+        reference = _reference(cards)
+        assert evaluator.hand_category(strength) == reference[0], (cards, strength, reference)
+        rated.append((strength, reference))
+    rated.sort()
+    for (strength, reference), (next_strength, next_reference) in zip(rated, rated[1:]):
+        assert (strength == next_strength) == (reference == next_reference) and reference <= next_reference, \
+            (reference, next_reference)
+
+    def rate(text):
+        return evaluator.evaluate(_cards(text))
+
+    # The wheel is a five-high straight: above trips, below a six-high straight
+    wheel = rate('Ac 2d 3h 4s 5c')
+    assert evaluator.hand_name(wheel) == 'Straight' and evaluator.hand_ranks(wheel) == ['5']
+    assert rate('Kc Kd Kh 4s 5c') < wheel < rate('2c 3d 4h 5s 6c')
+    # A steel wheel loses to a six-high straight flush and beats four of a kind
+    steel_wheel = rate('Ah 2h 3h 4h 5h')
+    assert evaluator.hand_name(steel_wheel) == 'Straight Flush'
+    assert rate('Ac Ad As Ah Kc') < steel_wheel < rate('2h 3h 4h 5h 6h')
+    assert evaluator.hand_name(rate('10h Jh Qh Kh Ah 2c 3d')) == 'Royal Flush'
+    # Three pairs: the third pair only plays as the kicker
+    three_pairs = rate('Kc Kd Qh Qs 9c 9d 2h')
+    assert evaluator.hand_name(three_pairs) == 'Two Pairs'
+    assert evaluator.hand_ranks(three_pairs) == ['K', 'Q', '9']
+    assert rate('Kc Kd Qh Qs 8c 7d 2h') < three_pairs < rate('Kc Kd Qh Qs 10c 7d 2h')
+    # Two sets of trips make a full house, the higher set full of the lower
+    two_sets = rate('Kc Kd Kh 7s 7c 7d 2h')
+    assert evaluator.hand_name(two_sets) == 'Full House' and evaluator.hand_ranks(two_sets) == ['K', '7']
+    assert rate('Kc Kd Kh 6s 6c 2d 3h') < two_sets < rate('Kc Kd Kh 8s 8c 2d 3h')
+
+
+def check_batch_evaluator(rows=5000):
+    # evaluate_hands_batch matches evaluate_indices row for row for 5, 6 and 7
+    # cards, and its categories index the matching PokerGame.HAND_RANKINGS label
+    import numpy as np
+    from batch_eval import evaluate_hands_batch
+    from new_texas import PokerGame
+
+    rng = random.Random(4)
+    made = [[card.index for card in _cards(text)] for text in
+            ('10h Jh Qh Kh Ah', 'Ah 2h 3h 4h 5h', 'Ac Ad As Ah Kc', 'Kc Kd Kh 7s 7c', '2c 7c 9c Jc Kc')]
+    for size in (5, 6, 7):
+        hands = [hand + rng.sample([i for i in range(52) if i not in hand], size - 5) for hand in made]
+        hands += [rng.sample(range(52), size) for _ in range(rows)]
+        strengths, categories = evaluate_hands_batch(np.array(hands))
+        for hand, strength, category in zip(hands, strengths.tolist(), categories.tolist()):
+            assert strength == evaluator.evaluate_indices(hand), (hand, strength)
+            assert PokerGame.HAND_RANKINGS[category] == evaluator.hand_name(strength), (hand, category)
+
+
+CHECKS = {
+    'evaluator': check_evaluator,
+    'batch_evaluator': check_batch_evaluator,
+    'seeded_replay': check_seeded_replay,
+    'side_pots_brute_force': check_side_pots_brute_force,
+    'all_in_side_pot': check_all_in_side_pot,
+    'folded_chips': check_folded_chips,
+    'odd_chip': check_odd_chip,
+    'chip_conservation': check_chip_conservation,
+    'single_funded_seat': check_single_funded_seat,
+    'blinds_cover_every_stack': check_blinds_cover_every_stack,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the engine regression checks")
+    parser.add_argument('names', nargs='*', help="checks to run (default: all)")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.names if name not in CHECKS]
+    if unknown:
+        parser.error(f"unknown checks: {', '.join(unknown)}")
+
+    failures = 0
+    for name in args.names or CHECKS:
+        try:
+            CHECKS[name]()
+        except AssertionError as error:
+            failures += 1
+            print(f"{name:<26}FAIL  {error}")
+        else:
+            print(f"{name:<26}ok")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(main())
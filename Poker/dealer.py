@@ -0,0 +1,62 @@
+import random
+
+from numpy.random import Generator, PCG64, SeedSequence
+
+from cards import Deck
+
+# Reproducible, independent random streams for dealing.
+#
+# Every hand gets its own generators, derived from the dealer's seed and the
+# hand number with numpy's SeedSequence, so a hand can be replayed from
+# (seed, hand_number) alone, whatever was dealt before it. Parallel workers
+# either split the hand numbers between them or each take one of spawn()'s
+# children; both ways their streams are statistically independent and no
+# generator is shared between processes or threads.
+#
+#   dealer = Dealer(seed)
+#   deck = dealer.deck(hand_number)             # the deck for that hand
+#   bots = dealer.rng(hand_number, BOTS)        # decisions for that hand
+#   workers = dealer.spawn(8)                   # one Dealer per worker
+#
+# hand_seeds() derives all of a hand's seeds from a single SeedSequence; a
+# long-running game reseeds the random.Random objects it keeps with them
+# rather than building new ones for every hand.
+
+DECK, BOTS = 0, 1  # stream ids within a hand
+STREAMS = 2
+SEED_WORDS = 8  # 32-bit words of state per stream seed
+_HANDS, _CHILDREN = 0, 1  # keeps hand streams and spawned dealers apart
+
+
+class Dealer:
+    def __init__(self, seed=None, spawn_key=()):
+        self.sequence = SeedSequence(seed, spawn_key=spawn_key)
+
+    @property
+    def seed(self):
+        # The entropy actually used; pass it back in to reproduce an unseeded run
+        return self.sequence.entropy
+
+    def _sequence(self, hand_number):
+        return SeedSequence(self.sequence.entropy, spawn_key=self.sequence.spawn_key + (_HANDS, hand_number))
+
+    def hand_seeds(self, hand_number):
+        # One integer seed per stream of the hand, for random.Random.seed()
+        state = self._sequence(hand_number).generate_state(STREAMS * SEED_WORDS).tobytes()
+        size = 4 * SEED_WORDS
+        return [int.from_bytes(state[i:i + size], 'little') for i in range(0, len(state), size)]
+
+    def rng(self, hand_number, stream=DECK):
+        # random.Random for one stream of one hand (what Deck and the bots use)
+        return random.Random(self.hand_seeds(hand_number)[stream])
+
+    def generator(self, hand_number):
+        # numpy Generator for the hand, for vectorized code; independent of the
+        # random.Random streams
+        return Generator(PCG64(self._sequence(hand_number).spawn(1)[0]))
+
+    def deck(self, hand_number):
+        return Deck(self.rng(hand_number))
+
+    def spawn(self, count):
+        return [Dealer(self.sequence.entropy, self.sequence.spawn_key + (_CHILDREN, i)) for i in range(count)]
@@ -0,0 +1,69 @@
+import queue
+import threading
+
+# Runs a PokerGame on a worker thread so showdowns and any slow engine work
+# never block the Tk mainloop. Only this thread touches the game once it has
+# started: the GUI posts messages on `actions` and reads immutable
+# TableSnapshots (or the exception that stopped the thread) from `updates`.
+#
+#   ('action', decision, raise_amount)   play the current player's decision
+#   ('new_hand',)                        deal the next hand
+#   ('stop',)                            end the thread
+
+
+class EngineThread:
+    def __init__(self, game):
+        self.game = game
+        self.actions = queue.Queue()
+        self.updates = queue.Queue()
+        self._decision = None
+        self._events = []
+        game.decision_provider = self._provide_decision
+        game.add_listener(self._record)
+        self.thread = threading.Thread(target=self._run, name='poker-engine', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def post(self, *message):
+        self.actions.put(message)
+
+    def stop(self):
+        self.post('stop')
+        self.thread.join()
+
+    def _provide_decision(self, game, player):
+        return self._decision
+
+    def _record(self, event, data):
+        # Player dicts keep changing on this thread, so events carry the name
+        if 'player' in data:
+            data = dict(data, player=data['player']['name'])
+        self._events.append((event, data))
+
+    def _handle(self, message):
+        if message[0] == 'new_hand':
+            if self.game.new_hand() and self.game.round > 5:
+                self.game.step()  # the blinds put everyone all-in, play the showdown
+        elif message[0] == 'action':
+            _, decision, raise_amount = message
+            self._decision = (decision, None)
+            self.game.step(raise_amount)
+            hand_over = any(event == 'hand_over' for event, _ in self._events)
+            if not hand_over and self.game.round > 5:
+                self.game.step()  # river betting is over, go straight to the showdown
+        else:
+            raise ValueError(f"unknown engine message {message[0]!r}")
+
+    def _run(self):
+        while True:
+            message = self.actions.get()
+            if message[0] == 'stop':
+                return
+            self._events = []
+            try:
+                self._handle(message)
+            except Exception as error:
+                self.updates.put(error)
+                return
+            self.updates.put(self.game.snapshot(self._events))
@@ -0,0 +1,329 @@
+import math
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from itertools import combinations, islice
+
+from cards import Deck
+from evaluator import evaluate_indices
+
+# Monte Carlo equity: deal random board completions and opponent hands from a
+# Deck with the known cards removed, and rank everyone with the evaluator.
+# exact_equity() enumerates the same space instead of sampling it, and
+# equity_batch() samples it in NumPy batches for large rollout budgets.
+
+Z_95 = 1.959964
+CHECK_EVERY = 500  # rollouts between early-stop checks
+BATCH_ROLLOUTS = 1 << 14  # rollouts per NumPy pass in equity_batch
+UNITS_PER_TASK = 256  # opponent-hand assignments per exact_equity worker task
+TASKS_IN_FLIGHT = 4  # queued exact_equity tasks per worker
+STRENGTH_CACHE_SIZE = 1 << 21  # memoized strengths a worker keeps between tasks
+PARTIAL_SHUFFLE_DRAWS = 12  # up to this many cards per rollout, shuffle only the ones drawn
+
+_strengths = {}  # card mask -> strength, per process, see _count_units
+
+
+def _result(wins, ties, share, share_sq, n, z):
+    equity = share / n
+    variance = max(share_sq / n - equity * equity, 0.0)
+    stderr = math.sqrt(variance / n)
+    return {
+        'win': wins / n,
+        'tie': ties / n,
+        'loss': (n - wins - ties) / n,
+        'equity': equity,
+        'stderr': stderr,
+        'ci': (max(equity - z * stderr, 0.0), min(equity + z * stderr, 1.0)),
+        'iterations': n,
+    }
+
+
+def equity(hole_cards, board=(), num_opponents=1, iterations=10000, seed=None, target_stderr=None, z=Z_95):
+    # Win/tie/loss fractions for hole_cards against num_opponents random hands.
+    # 'equity' counts a tie as the fraction of the pot it wins, and 'ci' is the
+    # z-interval around it. With target_stderr set the run stops as soon as the
+    # standard error of the equity estimate drops to that value.
+    if not 1 <= num_opponents <= 8:
+        raise ValueError("num_opponents must be between 1 and 8")
+    if iterations < 1:
+        raise ValueError("iterations must be at least 1")
+    if len(board) > 5:
+        raise ValueError("board has at most 5 cards")
+
+    deck = Deck(random.Random(seed))
+    deck.remove(list(hole_cards) + list(board))
+
+    hero = [card.index for card in hole_cards]
+    known_board = [card.index for card in board]
+    missing = 5 - len(known_board)
+    to_draw = missing + 2 * num_opponents
+    seats = range(missing, to_draw, 2)
+
+    wins = ties = 0
+    share = share_sq = 0.0
+    n = 0
+    for n in range(1, iterations + 1):
+        deck.rewind()
+        drawn = [card.index for card in deck.draw_cards(to_draw)]
+        runout = known_board + drawn[:missing]
+
+        hero_strength = evaluate_indices(hero + runout)
+        best = 0
+        tied = 0
+        for seat in seats:
+            strength = evaluate_indices(drawn[seat:seat + 2] + runout)
+            if strength > best:
+                best = strength
+                tied = 1
+            elif strength == best:
+                tied += 1
+
+        if hero_strength > best:
+            wins += 1
+            share += 1.0
+            share_sq += 1.0
+        elif hero_strength == best:
+            ties += 1
+            split = 1.0 / (tied + 1)
+            share += split
+            share_sq += split * split
+
+        if target_stderr is not None and n % CHECK_EVERY == 0:
+            if _result(wins, ties, share, share_sq, n, z)['stderr'] <= target_stderr:
+                break
+
+    return _result(wins, ties, share, share_sq, n, z)
+
+
+def equity_batch(hole_cards, board=(), num_opponents=1, iterations=100000, seed=None, z=Z_95,
+                 chunk_rollouts=BATCH_ROLLOUTS):
+    # Vectorized equity(): rollouts are dealt and ranked as NumPy arrays with
+    # batch_deal/batch_eval, chunk_rollouts at a time, which is what makes tens
+    # of thousands of rollouts per UI frame possible. Same result dict, without
+    # the early stop; seed goes to numpy's default_rng, so the samples are not
+    # the ones equity() draws for the same seed.
+    import numpy as np
+    from batch_deal import showdown_batch
+
+    if not 1 <= num_opponents <= 8:
+        raise ValueError("num_opponents must be between 1 and 8")
+    if iterations < 1:
+        raise ValueError("iterations must be at least 1")
+    if len(board) > 5:
+        raise ValueError("board has at most 5 cards")
+
+    hero = [card.index for card in hole_cards]
+    known_board = [card.index for card in board]
+    used = set(hero + known_board)
+    live = np.array([index for index in range(52) if index not in used], dtype=np.int64)
+    missing = 5 - len(known_board)
+    to_draw = missing + 2 * num_opponents
+    rng = np.random.default_rng(seed)
+
+    wins = ties = 0
+    share = share_sq = 0.0
+    for start in range(0, iterations, chunk_rollouts):
+        n = min(chunk_rollouts, iterations - start)
+        if to_draw <= PARTIAL_SHUFFLE_DRAWS:
+            # Partial Fisher-Yates on every row at once: to_draw swaps instead
+            # of an argsort of all the live cards
+            decks = np.tile(live, (n, 1))
+            rows = np.arange(n)
+            for i in range(to_draw):
+                j = i + (rng.random(n) * (len(live) - i)).astype(np.int64)
+                card = decks[rows, i]
+                decks[rows, i] = decks[rows, j]
+                decks[rows, j] = card
+            drawn = decks[:, :to_draw]
+        else:
+            drawn = live[np.argsort(rng.random((n, len(live))), axis=1)[:, :to_draw]]
+        boards = np.concatenate([np.broadcast_to(np.array(known_board, dtype=np.int64), (n, len(known_board))),
+                                 drawn[:, :missing]], axis=1)
+        hole = np.concatenate([np.broadcast_to(np.array(hero, dtype=np.int64), (n, 1, 2)),
+                               drawn[:, missing:].reshape(n, num_opponents, 2)], axis=1)
+        strengths, _ = showdown_batch(hole, boards)
+
+        hero_strength = strengths[:, 0]
+        best = strengths[:, 1:].max(axis=1)
+        won = hero_strength > best
+        tied = hero_strength == best
+        split = np.where(won, 1.0, np.where(tied, 1.0 / ((strengths[:, 1:] == best[:, None]).sum(axis=1) + 1), 0.0))
+        wins += int(won.sum())
+        ties += int(tied.sum())
+        share += float(split.sum())
+        share_sq += float((split * split).sum())
+
+    return _result(wins, ties, share, share_sq, iterations, z)
+
+
+def table_shares(hands, board, iterations, seed):
+    # (pot share won by each hand, runouts played) for fully known hole cards,
+    # over random completions of board, or over every one when iterations is None
+    used = set(board).union(*hands)
+    live = [index for index in range(52) if index not in used]
+    missing = 5 - len(board)
+    if iterations is None:
+        runouts = combinations(live, missing)
+    else:
+        rng = random.Random(seed)
+        runouts = (rng.sample(live, missing) for _ in range(iterations))
+
+    shares = [0.0] * len(hands)
+    n = 0
+    for runout in runouts:
+        full = board + list(runout)
+        strengths = [evaluate_indices(hand + full) for hand in hands]
+        best = max(strengths)
+        winners = [i for i, strength in enumerate(strengths) if strength == best]
+        for i in winners:
+            shares[i] += 1.0 / len(winners)
+        n += 1
+    return shares, n
+
+
+def table_equity(hole_hands, board=(), iterations=10000, seed=None):
+    # Equity of every hand when all hole cards are known, e.g. for a table
+    # overlay. iterations=None enumerates every board completion instead.
+    if not 2 <= len(hole_hands) <= 9:
+        raise ValueError("table_equity needs between 2 and 9 hands")
+    if len(board) > 5:
+        raise ValueError("board has at most 5 cards")
+    hands = [[card.index for card in hand] for hand in hole_hands]
+    shares, n = table_shares(hands, [card.index for card in board], iterations, seed)
+    return [share / n for share in shares]
+
+
+def _opponent_hands(cards, count, start=0):
+    # Every set of `count` disjoint two-card hands from cards, each set once
+    if count == 0:
+        yield ()
+        return
+    for i in range(start, len(cards)):
+        for j in range(i + 1, len(cards)):
+            rest = cards[:i] + cards[i + 1:j] + cards[j + 1:]
+            for others in _opponent_hands(rest, count - 1, i):
+                yield ((cards[i], cards[j]),) + others
+
+
+def _count_units(args):
+    # Worker: outcome counts for a list of opponent-hand assignments, each
+    # against every completion of the board from the cards they leave live.
+    # Strengths are memoized by card mask: the same hand meets the same board
+    # under many assignments.
+    hero, known_board, missing, live, units = args
+    if len(_strengths) > STRENGTH_CACHE_SIZE:
+        _strengths.clear()
+    strengths = _strengths
+    board_mask = 0
+    for card in known_board:
+        board_mask |= 1 << card
+    hero_mask = (1 << hero[0]) | (1 << hero[1])
+
+    wins = losses = 0
+    split_counts = [0] * 10  # split_counts[k]: outcomes where the pot is split k ways
+    for hands in units:
+        used = {card for hand in hands for card in hand}
+        remaining = [card for card in live if card not in used]
+        masks = [(1 << hand[0]) | (1 << hand[1]) for hand in hands]
+        for runout in combinations(remaining, missing):
+            mask = board_mask
+            for card in runout:
+                mask |= 1 << card
+            hero_strength = strengths.get(mask | hero_mask)
+            if hero_strength is None:
+                hero_strength = strengths[mask | hero_mask] = evaluate_indices(hero + known_board + list(runout))
+            best = 0
+            tied = 0
+            for hand, hand_mask in zip(hands, masks):
+                strength = strengths.get(mask | hand_mask)
+                if strength is None:
+                    strength = strengths[mask | hand_mask] = evaluate_indices(list(hand) + known_board + list(runout))
+                if strength > best:
+                    best = strength
+                    tied = 1
+                elif strength == best:
+                    tied += 1
+            if hero_strength > best:
+                wins += 1
+            elif hero_strength == best:
+                split_counts[tied + 1] += 1
+            else:
+                losses += 1
+    return wins, losses, split_counts
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def exact_equity(hole_cards, board=(), num_opponents=1, opponent_hands=(), workers=None):
+    # Exact counterpart of equity(): every opponent-hand combination and every
+    # board completion is counted once, split across a process pool. Opponents
+    # listed in opponent_hands are fixed; the other num_opponents are enumerated.
+    # Counts are integers, so the result is the same for any number of workers
+    # (default: one per CPU; workers=1 runs in this process).
+    # Meant for flop/turn/river and small fields; preflop enumeration is huge.
+    num_opponents = max(num_opponents, len(opponent_hands))
+    if not 1 <= num_opponents <= 8:
+        raise ValueError("num_opponents must be between 1 and 8")
+    if len(board) > 5:
+        raise ValueError("board has at most 5 cards")
+
+    deck = Deck()
+    deck.remove(list(hole_cards) + list(board) + [card for hand in opponent_hands for card in hand])
+    live = sorted(card.index for card in deck.show())
+
+    hero = [card.index for card in hole_cards]
+    known_board = [card.index for card in board]
+    fixed = tuple(tuple(card.index for card in hand) for hand in opponent_hands)
+    missing = 5 - len(known_board)
+
+    # Work units: one opponent-hand assignment each, generated lazily and sent
+    # UNITS_PER_TASK at a time with a bounded number of tasks in flight, so
+    # neither the unit list nor the task queue is ever held in full
+    units = (fixed + hands for hands in _opponent_hands(live, num_opponents - len(fixed)))
+    tasks = ((hero, known_board, missing, live, batch) for batch in _batches(units, UNITS_PER_TASK))
+
+    wins = losses = 0
+    split_counts = [0] * 10
+
+    def add(counts):
+        nonlocal wins, losses
+        wins += counts[0]
+        losses += counts[1]
+        for k in range(10):
+            split_counts[k] += counts[2][k]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for task in tasks:
+            add(_count_units(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque()
+            for task in tasks:
+                if len(in_flight) >= TASKS_IN_FLIGHT * workers:
+                    add(in_flight.popleft().result())
+                in_flight.append(pool.submit(_count_units, task))
+            while in_flight:
+                add(in_flight.popleft().result())
+
+    ties = sum(split_counts)
+    total = wins + losses + ties
+    share = wins + sum(Fraction(split_counts[k], k) for k in range(2, 10))
+    return {
+        'win': Fraction(wins, total),
+        'tie': Fraction(ties, total),
+        'loss': Fraction(losses, total),
+        'equity': share / total,
+        'stderr': 0.0,
+        'ci': (share / total, share / total),
+        'iterations': total,
+    }
@@ -0,0 +1,214 @@
+from cards import RANK_FACES, mask_to_indices
+
+# Table-driven hand evaluator.
+#
+# Cards are handled by their Card.index (rank * 4 + suit, see cards.py).
+# evaluate() takes up to 7 cards and returns one integer strength; a higher
+# number always means a better hand, so showdowns only have to compare ints.
+#
+# Strength layout: category << 20 followed by up to five 4-bit rank slots
+# (rank + 1, most significant first, 0 for an empty slot).
+
+HIGH_CARD, ONE_PAIR, TWO_PAIRS, THREE_OF_A_KIND, STRAIGHT, FLUSH, FULL_HOUSE, \
+    FOUR_OF_A_KIND, STRAIGHT_FLUSH, ROYAL_FLUSH = range(10)
+
+# Same labels as PokerGame.HAND_RANKINGS, indexed by category
+CATEGORY_NAMES = ("High Card", "One Pair", "Two Pairs", "Three of a Kind", "Straight", "Flush",
+                  "Full House", "Four of a Kind", "Straight Flush", "Royal Flush")
+
+CATEGORY_SHIFT = 20
+MAX_CARDS = 7
+
+# Every card adds 1 to its rank's 3-bit counter and 1 to its suit's 4-bit counter.
+# Summing the weights of a hand gives the rank multiset in the low bits and the
+# suit counts above SUIT_SHIFT, so a single addition per card is all the work
+# that is done before the table lookup.
+SUIT_SHIFT = 40
+RANK_KEY_MASK = (1 << SUIT_SHIFT) - 1
+FLUSH_PROBE = 0x3333  # a suit nibble reaches 8 once 3 is added to a count of 5 or more
+FLUSH_FLAGS = 0x8888
+
+CARD_WEIGHTS = tuple((1 << (3 * (i >> 2))) + (1 << (SUIT_SHIFT + 4 * (i & 3))) for i in range(52))
+CARD_RANK_BITS = tuple(1 << (i >> 2) for i in range(52))
+
+
+def _pack(category, ranks):
+    strength = category
+    for slot in range(5):
+        strength <<= 4
+        if slot < len(ranks):
+            strength |= ranks[slot] + 1
+    return strength
+
+
+def _straight_top(mask):
+    for top in range(12, 3, -1):
+        window = 0x1F << (top - 4)
+        if mask & window == window:
+            return top
+    if mask & 0x100F == 0x100F:  # wheel: A 2 3 4 5
+        return 3
+    return -1
+
+
+def _build_straight_table():
+    return [_straight_top(mask) for mask in range(1 << 13)]
+
+
+def _build_flush_table(straights):
+    table = [0] * (1 << 13)
+    for mask in range(1 << 13):
+        if bin(mask).count('1') < 5:
+            continue
+        top = straights[mask]
+        if top == 12:
+            table[mask] = _pack(ROYAL_FLUSH, [top])
+        elif top >= 0:
+            table[mask] = _pack(STRAIGHT_FLUSH, [top])
+        else:
+            ranks = [rank for rank in range(12, -1, -1) if mask >> rank & 1]
+            table[mask] = _pack(FLUSH, ranks[:5])
+    return table
+
+
+def _strength_from_counts(counts):
+    quads, trips, pairs, present = [], [], [], []
+    mask = 0
+    for rank in range(12, -1, -1):
+        count = counts[rank]
+        if count == 0:
+            continue
+        mask |= 1 << rank
+        present.append(rank)
+        if count == 4:
+            quads.append(rank)
+        elif count == 3:
+            trips.append(rank)
+        elif count == 2:
+            pairs.append(rank)
+
+    if quads:
+        quad = quads[0]
+        return _pack(FOUR_OF_A_KIND, [quad] + [rank for rank in present if rank != quad][:1])
+    if trips and (len(trips) > 1 or pairs):
+        paired = max(trips[1:] + pairs[:1])
+        return _pack(FULL_HOUSE, [trips[0], paired])
+    top = STRAIGHT_TABLE[mask]
+    if top >= 0:
+        return _pack(STRAIGHT, [top])
+    if trips:
+        return _pack(THREE_OF_A_KIND, trips[:1] + [rank for rank in present if rank != trips[0]][:2])
+    if len(pairs) >= 2:
+        kickers = [rank for rank in present if rank not in pairs[:2]]
+        return _pack(TWO_PAIRS, pairs[:2] + kickers[:1])
+    if pairs:
+        return _pack(ONE_PAIR, pairs + [rank for rank in present if rank != pairs[0]][:3])
+    return _pack(HIGH_CARD, present[:5])
+
+
+STRAIGHT_TABLE = _build_straight_table()
+FLUSH_TABLE = _build_flush_table(STRAIGHT_TABLE)
+
+# Rank multiset key -> strength. There are ~76k multisets of up to seven ranks and
+# computing all of them takes a few hundred ms, so entries are filled the first
+# time a key is seen; fill_rank_table() completes the table up front.
+RANK_TABLE = {}
+
+
+def _add_rank_entry(key):
+    strength = _strength_from_counts([(key >> (3 * rank)) & 7 for rank in range(13)])
+    RANK_TABLE[key] = strength
+    return strength
+
+
+def fill_rank_table():
+    counts = [0] * 13
+
+    def fill(rank, left, key):
+        if rank < 0:
+            if key not in RANK_TABLE:
+                RANK_TABLE[key] = _strength_from_counts(counts)
+            return
+        for count in range(min(4, left) + 1):
+            counts[rank] = count
+            fill(rank - 1, left - count, key + (count << (3 * rank)))
+        counts[rank] = 0
+
+    fill(12, MAX_CARDS, 0)
+    return RANK_TABLE
+
+
+def _strength(key, indices):
+    flags = ((key >> SUIT_SHIFT) + FLUSH_PROBE) & FLUSH_FLAGS
+    if flags:
+        # At most one suit can hold five of seven cards, and a flush always beats
+        # anything the remaining two cards could add.
+        suit = (flags.bit_length() - 4) >> 2
+        mask = 0
+        for index in indices:
+            if index & 3 == suit:
+                mask |= CARD_RANK_BITS[index]
+        return FLUSH_TABLE[mask]
+    key &= RANK_KEY_MASK
+    try:
+        return RANK_TABLE[key]
+    except KeyError:
+        return _add_rank_entry(key)
+
+
+def evaluate_indices(indices):
+    return _strength(sum(map(CARD_WEIGHTS.__getitem__, indices)), indices)
+
+
+def showdown(hole_hands, board):
+    # Strengths of several hole-card hands on one shared board, plus the
+    # positions of every hand tied for best. The board is summed once and each
+    # hand only adds its own cards, so the cost is linear in the number of hands.
+    board = [card.index for card in board]
+    board_key = sum(map(CARD_WEIGHTS.__getitem__, board))
+    strengths = []
+    winners = []
+    best = -1
+    for position, hand in enumerate(hole_hands):
+        hole = [card.index for card in hand]
+        strength = _strength(board_key + sum(map(CARD_WEIGHTS.__getitem__, hole)), hole + board)
+        strengths.append(strength)
+        if strength > best:
+            best = strength
+            winners = [position]
+        elif strength == best:
+            winners.append(position)
+    return strengths, winners
+
+
+def evaluate(cards):
+    return evaluate_indices([card.index for card in cards])
+
+
+def evaluate_mask(mask):
+    # Hand or board stored as a 52-bit card mask (see cards.cards_to_mask)
+    return evaluate_indices(mask_to_indices(mask))
+
+
+def evaluate_best(hole_cards, board):
+    # Strength of hole_cards + board as two separate card lists
+    return evaluate(list(hole_cards) + list(board))
+
+
+def hand_category(strength):
+    return strength >> CATEGORY_SHIFT
+
+
+def hand_name(strength):
+    return CATEGORY_NAMES[strength >> CATEGORY_SHIFT]
+
+
+def hand_ranks(strength):
+    # Face values that decide the hand, most significant first
+    ranks = []
+    for shift in range(16, -1, -4):
+        slot = (strength >> shift) & 0xF
+        if slot:
+            ranks.append(RANK_FACES[slot - 1])
+    return ranks
+
@@ -0,0 +1,90 @@
+import argparse
+import time
+
+from new_texas import PokerGame
+
+# Play hands without a window: PokerGame gets scripted decision providers
+# instead of the Tk buttons and the hand is driven by calling the engine
+# directly. Run from this directory with `python -m headless`.
+
+ACTIONS = ('call', 'raise', 'fold', 'hold')
+MAX_STEPS = 1000  # engine calls per hand before giving up on it
+
+
+def random_player(rng=None, weights=(6, 2, 1, 1)):
+    # Without an rng the game's own stream is used, so seeded games replay exactly
+    def decide(game, player):
+        source = rng or game.rng
+        decision = source.choices(ACTIONS, weights)[0]
+        raise_amount = 10 * source.randint(1, 5) if decision == 'raise' else None
+        return decision, raise_amount
+    return decide
+
+
+def scripted_player(actions):
+    # Cycles through a list of decisions or (decision, raise_amount) pairs
+    actions = [action if isinstance(action, tuple) else (action, None) for action in actions]
+    position = [0]
+
+    def decide(game, player):
+        action = actions[position[0] % len(actions)]
+        position[0] += 1
+        return action
+    return decide
+
+
+def create_game(num_players=2, decision_provider=None, seed=None):
+    game = PokerGame(decision_provider or random_player(), seed=seed)
+    game.verbose = False
+    for i in range(1, num_players + 1):
+        game.add_player('Player' + str(i))
+    return game
+
+
+def play_hand(game):
+    finished = []
+    listener = lambda event, data: finished.append(data['winner']) if event == 'hand_over' else None
+    game.add_listener(listener)
+    try:
+        if not game.new_hand():
+            raise RuntimeError("Fewer than two players have chips left")
+        for _ in range(MAX_STEPS):
+            if finished:
+                return finished[0]
+            game.step()
+        raise RuntimeError("Hand did not finish")
+    finally:
+        game.listeners.remove(listener)
+
+
+def play_hands(game, num_hands, starting_money=500):
+    # Busted tables are topped back up so the session always runs num_hands
+    winners = []
+    for _ in range(num_hands):
+        if sum(1 for player in game.players if player['money'] > 0) < 2:
+            for player in game.players:
+                player['money'] = starting_money
+        winners.append(play_hand(game))
+    return winners
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play poker hands without the GUI")
+    parser.add_argument('--hands', type=int, default=1000)
+    parser.add_argument('--players', type=int, default=2, choices=range(2, 10))
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--stats', action='store_true', help="time the engine hot paths and print the stats")
+    args = parser.parse_args()
+
+    if args.stats:
+        import instrument
+        from new_texas import instrumented
+        instrument.enable(instrumented(gui=False))
+
+    game = create_game(args.players, seed=args.seed)
+    start = time.perf_counter()
+    play_hands(game, args.hands)
+    elapsed = time.perf_counter() - start
+    print(f"{args.hands} hands, {args.players} players: {elapsed:.2f}s ({args.hands / elapsed:.0f} hands/s)")
+    if args.stats:
+        print(instrument.format_stats())
@@ -0,0 +1,152 @@
+import functools
+import json
+import threading
+import time
+
+# Opt-in timers for the hot paths.
+#
+# enable(targets) swaps each listed method for a wrapper that records its wall
+# time into a histogram; disable() puts the originals back. Nothing is wrapped
+# until enable() is called, so the cost when instrumentation is off is zero.
+# Histograms use power-of-two microsecond buckets, so percentiles are upper
+# bounds accurate to a factor of two; count, total, min and max are exact.
+#
+#   instrument.enable(new_texas.instrumented())    # gui=False for headless runs
+#   ...
+#   instrument.stats()          -> {name: {'count', 'total_s', 'mean_us', ...}}
+#   instrument.dump(path)       -> same as JSON
+#   print(instrument.format_stats())
+
+NUM_BUCKETS = 28  # bucket i holds times below 2**i microseconds; the last one is open
+
+
+class Histogram:
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets = [0] * NUM_BUCKETS
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[min(int(seconds * 1e6).bit_length(), NUM_BUCKETS - 1)] += 1
+
+    def percentile(self, fraction):
+        # Upper bound of the bucket holding the given fraction of calls, in us
+        wanted = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= wanted:
+                return min(float(1 << index), self.max * 1e6)
+        return self.max * 1e6
+
+    def summary(self):
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'total_s': self.total,
+            'mean_us': self.total / self.count * 1e6,
+            'min_us': self.min * 1e6,
+            'p50_us': self.percentile(0.50),
+            'p90_us': self.percentile(0.90),
+            'p99_us': self.percentile(0.99),
+            'max_us': self.max * 1e6,
+        }
+
+
+_histograms = {}
+_originals = {}  # (owner, attribute) -> the unwrapped function
+_dumper = None
+
+
+def _timed(name, function):
+    histogram = _histograms.setdefault(name, Histogram())
+    clock = time.perf_counter
+
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            histogram.add(clock() - start)
+    return timed
+
+
+def enable(targets):
+    # targets: iterable of (class or module, attribute names); each one is
+    # recorded as '<owner name>.<attribute>'
+    for owner, names in targets:
+        for name in names:
+            if (owner, name) in _originals:
+                continue
+            function = owner.__dict__[name]
+            _originals[(owner, name)] = function
+            setattr(owner, name, _timed(f'{owner.__name__}.{name}', function))
+
+
+def disable():
+    while _originals:
+        (owner, name), function = _originals.popitem()
+        setattr(owner, name, function)
+    stop_periodic_dump()
+
+
+def enabled():
+    return bool(_originals)
+
+
+def reset():
+    for histogram in _histograms.values():
+        histogram.__init__()
+
+
+def stats():
+    return {name: histogram.summary() for name, histogram in sorted(_histograms.items())}
+
+
+def dump(path):
+    with open(path, 'w') as f:
+        json.dump({'time': time.time(), 'stats': stats()}, f, indent=2)
+
+
+def format_stats():
+    lines = [f"{'timer':<44}{'calls':>10}{'total s':>10}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'max us':>10}"]
+    for name, summary in stats().items():
+        if summary['count']:
+            lines.append(f"{name:<44}{summary['count']:>10}{summary['total_s']:>10.3f}{summary['mean_us']:>10.1f}"
+                         f"{summary['p50_us']:>10.0f}{summary['p99_us']:>10.0f}{summary['max_us']:>10.0f}")
+    return '\n'.join(lines)
+
+
+def start_periodic_dump(path, interval=5.0):
+    # Rewrite path with the current stats every interval seconds, from a daemon thread
+    global _dumper
+    stop_periodic_dump()
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            dump(path)
+    thread = threading.Thread(target=run, name='instrument-dump', daemon=True)
+    _dumper = (stop, thread)
+    thread.start()
+
+
+def stop_periodic_dump():
+    global _dumper
+    if _dumper is not None:
+        stop, thread = _dumper
+        stop.set()
+        thread.join()
+        _dumper = None
@@ -0,0 +1,91 @@
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+
+from equity import table_shares
+
+# Background equities for the hands on the table, for the GUI overlay.
+#
+# request() drops whatever is still queued for an older board and submits a
+# new series of jobs to a process pool. Preflop that is Monte Carlo batches of
+# growing size; every finished batch is folded into running totals, so the
+# first estimate arrives quickly and then converges. From the flop on an exact
+# enumeration is cheap enough to be the only job. poll() is called from the
+# Tk thread and never blocks.
+
+STAGES = (250, 1000, 4000, 16000)  # Monte Carlo runouts per preflop batch
+EXACT_MISSING = 2  # enumerate when at most this many board cards are unknown
+
+
+class LiveEquity:
+    def __init__(self, workers=2, stages=STAGES):
+        self.workers = workers
+        self.stages = stages
+        self.generation = 0
+        self.pending = 0
+        self._pool = None
+        self._futures = []
+        self._done = queue.Queue()
+        self._shares = []
+        self._iterations = 0
+
+    def _executor(self):
+        # Spawned rather than forked: the workers only need equity.py, not Tk
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+
+    def cancel(self):
+        self.generation += 1
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+        self.pending = 0
+
+    def request(self, hole_hands, board):
+        self.cancel()
+        hands = [[card.index for card in hand] for hand in hole_hands]
+        board = [card.index for card in board]
+        self._shares = [0.0] * len(hands)
+        self._iterations = 0
+
+        if 5 - len(board) <= EXACT_MISSING:
+            jobs = [(hands, board, None, None)]
+        else:
+            jobs = [(hands, board, iterations, self.generation * len(self.stages) + i)
+                    for i, iterations in enumerate(self.stages)]
+
+        generation = self.generation
+        pool = self._executor()
+        for job in jobs:
+            future = pool.submit(table_shares, *job)
+            future.add_done_callback(lambda future: self._done.put((generation, future)))
+            self._futures.append(future)
+        self.pending = len(jobs)
+
+    def poll(self):
+        # (equities, runouts, finished) when new results came in since the
+        # last call, else None. Results for an older request are dropped.
+        updated = False
+        while True:
+            try:
+                generation, future = self._done.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self.generation or future.cancelled():
+                continue
+            shares, n = future.result()
+            self._shares = [total + share for total, share in zip(self._shares, shares)]
+            self._iterations += n
+            self.pending -= 1
+            updated = True
+        if not updated:
+            return None
+        return [share / self._iterations for share in self._shares], self._iterations, self.pending == 0
+
+    def close(self):
+        self.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -1,100 +1,180 @@
 import random
-from collections import Counter
-import tkinter as tk
-from tkinter import messagebox
-from PIL import Image, ImageTk
-from tkinter import simpledialog
 import os
-import tkinter.font as tkFont
-
-class Card:
-    ACE, JACK, QUEEN, KING = 'A', 'J', 'Q', 'K'
-    FACES = (ACE, '2', '3', '4', '5', '6', '7', '8', '9', '10', JACK, QUEEN, KING)
-    SUITS = tuple(map(chr, (9824, 9827, 9829, 9830)))
-    SPADE, CLUB, HEART, DIAMOND = SUITS  # ♠ ♣ ♥ ♦
-
-    def __init__(self, suit, face):
-        self._suit = suit
-        self._face = face
-
-    def __int__(self):
-        if self._face == Card.JACK:
-            return 11
-        if self._face == Card.QUEEN:
-            return 12
-        if self._face == Card.KING:
-            return 13
-
-        return 1 if self._face == Card.ACE else int(self._face)
-
-    def __str__(self):
-        return self._suit + str(self._face)
+import queue
+from functools import lru_cache
+from types import MappingProxyType
+from cards import Card, Deck
+from evaluator import evaluate, hand_name, hand_ranks, showdown
+
+# The Tk/PIL stack is imported by load_gui() when the first window is created,
+# so headless code and worker processes can import PokerGame without paying
+# for it. bench.py checks the import time of this module.
+tk = messagebox = simpledialog = tkFont = None
+LazySprites = LiveEquity = None
+
+
+def load_gui():
+    global tk, messagebox, simpledialog, tkFont, LazySprites, LiveEquity
+    if tk is not None:
+        return
+    import tkinter as tk
+    from tkinter import messagebox, simpledialog
+    import tkinter.font as tkFont
+    from sprites import LazySprites
+    from live_equity import LiveEquity
+
+
+def __getattr__(name):
+    # BackgroundFrame moved to background.py with the rest of the Tk-only code
+    if name == 'BackgroundFrame':
+        from background import BackgroundFrame
+        return BackgroundFrame
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class Player:
+    # One seat at the table. The engine uses attributes; player['money'] style
+    # item access still works for the GUI, scripts and TableSnapshot. Setting
+    # money or decision tells the table, which keeps its active-seat set
+    # current without rescanning the players.
+    __slots__ = ('name', 'hand', 'bet', 'contributed', 'seat', '_money', '_decision', '_table')
+    FIELDS = ('name', 'hand', 'money', 'decision', 'bet')
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, name, seat, table, money=500):
+        self.name = name
+        self.hand = []
+        self.bet = 0
+        self.contributed = 0  # chips put into the pot this hand, over every street
+        self.seat = seat
+        self._table = table
+        self._money = money
+        self._decision = None
+
+    @property
+    def money(self):
+        return self._money
+
+    @money.setter
+    def money(self, value):
+        self._money = value
+        self._table._seat_changed(self)
+
+    @property
+    def decision(self):
+        return self._decision
+
+    @decision.setter
+    def decision(self, value):
+        self._decision = value
+        self._table._seat_changed(self)
+
+    def is_active(self):
+        return self._money > 0 and self._decision != 'fold'
+
+    def keys(self):
+        return self.FIELDS
+
+    def __getitem__(self, key):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
 
     def __repr__(self):
-        return __class__.__name__ + repr((self._suit, self._face))
-
-class Deck:
-    def __init__(self):
-        self._deck = [Card(suit, face) for suit in Card.SUITS for face in Card.FACES]
-
-    def show(self):
-        return self._deck
-
-    def shuffle(self):
-        random.shuffle(self._deck)
-
-    def __iter__(self):
-        return iter(self._deck)
+        return f"Player({self.name!r}, money={self._money}, bet={self.bet}, decision={self._decision!r})"
 
-    def draw_cards(self, num_cards=1):
-        if num_cards > len(self._deck):
-            raise ValueError("Not enough cards in the deck")
-
-        drawn_indices = random.sample(range(len(self._deck)), num_cards)
-        drawn_cards = [self._deck.pop(i) for i in sorted(drawn_indices, reverse=True)]
-
-        return drawn_cards
-
-    def create_deck():
-        suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
-        deck = [Card(suit, rank) for suit in suits for rank in ranks]
-        return deck
 
 class PokerGame:
     HAND_RANKINGS = ["Royal Flush", "Straight Flush", "Four of a Kind", "Full House", "Flush", "Straight",
                       "Three of a Kind", "Two Pairs", "One Pair", "High Card", "Straight (No Flush)"]
 
-    def __init__(self):
+    def __init__(self, decision_provider=None, seed=None, small_blind=10, big_blind=20):
         self.deck = Deck()
         self.players = []
+        self.seat_index = {}  # player name -> seat (index into players)
+        self.active_seats = set()  # seats with money left that have not folded
+        self._active_order = None  # sorted active seats and their names, rebuilt after a change
         self.community_cards = []
         self.pot = 0
-        self.current_highest_bet = 0
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        # Betting state of the current street, updated per action (see betting_round)
+        self.current_bet = 0  # highest bet this street
+        self.min_raise = big_blind  # smallest raise increment allowed
+        self.last_aggressor = None  # seat of the last bet or raise
+        self.pending = set()  # seats that still have to act before the street closes
+        self.in_hand = set()  # seats dealt in this hand that have not folded
         self.raise_amount = 0
         self.current_player_index = 0
-        self.small_blind_player = 'Player1'
-        self.total_raise_amount = 20
         self.tie_flag = 0
-        self.active_players = self.players
+        self.round = 1  # 1 preflop, 2 flop, 3 turn, 4 river, 6 showdown pending
+        # decision_provider(game, player) -> (decision, raise_amount or None);
+        # the GUI plugs in its buttons, headless.py plugs in scripted players
+        self.decision_provider = decision_provider
+        self.listeners = []
+        self.verbose = True  # console trace of every action
+        # With a seed every hand is dealt from its own streams (dealer.py), so
+        # new_hand(n) replays hand n; rng is the matching stream for bots.
+        # Without one the global random module is used.
+        self.dealer = None
+        self.rng = random
+        if seed is not None:
+            from dealer import Dealer
+            self.dealer = Dealer(seed)
+            self.deck_rng = random.Random()
+            self.deck = Deck(self.deck_rng)
+            self.rng = random.Random()
+        self.hand_number = 0
+
+    def add_listener(self, listener):
+        # listener(event, data) is called for 'action', 'street_complete',
+        # 'community_cards', 'showdown', 'hand_over' and 'game_over'
+        self.listeners.append(listener)
+
+    def emit(self, event, **data):
+        for listener in self.listeners:
+            listener(event, data)
 
     def add_player(self, player_name):
-        self.players.append({'name': player_name, 'hand': [], 'money': 500, 'decision': None, 'bet': 0})
-    
+        player = Player(player_name, len(self.players), self)
+        self.players.append(player)
+        self.seat_index[player_name] = player.seat
+        self._seat_changed(player)
+
+    def _seat_changed(self, player):
+        # Called by Player whenever its money or decision is set
+        if player.is_active():
+            if player.seat not in self.active_seats:
+                self.active_seats.add(player.seat)
+                self._active_order = None
+        elif player.seat in self.active_seats:
+            self.active_seats.discard(player.seat)
+            self._active_order = None
+
+    def _active(self):
+        if self._active_order is None:
+            seats = sorted(self.active_seats)
+            self._active_order = (seats, [self.players[seat].name for seat in seats])
+        return self._active_order
+
     def get_active_players(self):
-        return [player['name'] for player in self.active_players if player['money'] > 0 and player['decision']!='fold']
-    
+        # Names in seat order; the list is shared, so treat it as read-only
+        return self._active()[1]
+
+    def get_active_seats(self):
+        return [self.players[seat] for seat in self._active()[0]]
+
     def get_money(self, player_name):
-        for player in self.players:
-            if player['name'] == player_name:
-                return player['money']
-        return None
+        player = self.get_player_by_name(player_name)
+        return None if player is None else player.money
 
     def get_bet(self,player_name):
-        for player in self.players:
-            if player['name'] == player_name:
-                return player['bet']
-        return None
+        player = self.get_player_by_name(player_name)
+        return None if player is None else player.bet
     
     def get_pot(self):
         return self.pot
@@ -106,16 +186,17 @@ class PokerGame:
         return self.tie_flag
     
     def get_player_by_name(self, player_name):
-        for player in self.players:
-            if player['name'] == player_name:
-                return player
-        return None 
+        seat = self.seat_index.get(player_name)
+        return None if seat is None else self.players[seat]
 
-    def get_player_decision(self):
-        current_player = self.players[self.current_player_index]
-        decision = gui.enable_button()
+    def get_player_decision(self, current_player=None):
+        if current_player is None:
+            current_player = self.players[self.current_player_index]
+        decision, raise_amount = self.decision_provider(self, current_player)
+        if raise_amount is not None:
+            self.raise_amount = raise_amount
 
-        return decision, current_player['bet']
+        return decision, current_player.bet
         
     def increment_current_player_index(self):
         self.current_player_index = (self.current_player_index + 1) % len(self.players)
@@ -124,347 +205,289 @@ class PokerGame:
         return self.current_player_index
     
     def evaluate_hand(self, private_cards, community_cards):
-        all_cards = private_cards + community_cards
-
-        values = [card.__int__() for card in all_cards]
-        suits = [card._suit for card in all_cards]
+        strength = self.hand_strength(private_cards, community_cards)
+        return hand_name(strength), hand_ranks(strength)
 
-        # Count occurrences of each value and suit
-        value_counts = Counter(values)
-        suit_counts = Counter(suits)
+    def hand_strength(self, private_cards, community_cards):
+        # One comparable integer per hand, kickers included (higher wins)
+        return evaluate(private_cards + community_cards)
 
-        # Check for flush
-        is_flush = any(count >= 5 for count in suit_counts.values())
-        flush_suit = [suit for suit, count in suit_counts.items() if count >= 5]
+    def showdown_strengths(self, hands):
+        # (strength of each hole hand with the board, indices of the best ones);
+        # the one evaluator call a showdown makes, so instrumented() times it
+        return showdown(hands, self.community_cards)
 
-        # Check for straight
-        sorted_values = sorted(set(values))
-        is_straight = any(sorted_values[i:i+5] == list(range(sorted_values[i], sorted_values[i]+5))
-                        for i in range(len(sorted_values) - 4))
-
-        if is_straight and is_flush:
-            if 14 in sorted_values:
-                return "Royal Flush", flush_suit[0]
-            else:
-                return "Straight Flush", flush_suit[0]
-        elif 4 in value_counts.values():
-            return "Four of a Kind", max(value_counts, key=value_counts.get)
-        elif 3 in value_counts.values() and 2 in value_counts.values():
-            three_of_a_kind=''
-            two_of_a_kind=''
-            for key, value in value_counts.items():
-                if value == 2:
-                    two_of_a_kind=key
-                elif value==3:
-                    three_of_a_kind=key
-            return "Full House", [three_of_a_kind, two_of_a_kind]
-        elif is_flush:
-            return "Flush", flush_suit[0]
-        elif is_straight:
-            return "Straight", None
-        elif 3 in value_counts.values():
-            return "Three of a Kind", max(value_counts, key=value_counts.get)
-        elif list(value_counts.values()).count(2) >= 2:
-            pairs = [value for value, count in value_counts.items() if count == 2]
-            return "Two Pairs", pairs
-        elif list(value_counts.values()).count(2) == 1:
-            return "One Pair", max(value_counts, key=value_counts.get)
-        else:
-            return "High Card", max(values) 
+    def evaluate_hands_batch(self, cards_array):
+        # NumPy version for (N, 7) arrays of card indices, see batch_eval.py
+        from batch_eval import evaluate_hands_batch
+        return evaluate_hands_batch(cards_array)
 
     def deal_hands(self, player, num_cards=2):
-        player['hand'] = self.deck.draw_cards(num_cards)
+        player.hand = self.deck.draw_cards(num_cards)
 
     def deal_community_cards(self, num_cards):
         revealed_cards = self.deck.draw_cards(num_cards)
         self.community_cards.extend(revealed_cards)
 
+    def side_pots(self):
+        # [(amount, eligible seats)], main pot first, from what each seat put in.
+        # One pass up the sorted contributions: every distinct level a contender
+        # reached closes a pot holding each seat's chips between the previous
+        # level and this one; folded chips count but never make a seat eligible.
+        contributions = sorted(player.contributed for player in self.players if player.contributed)
+        contenders = sorted(self.in_hand, key=lambda seat: self.players[seat].contributed)
+        pots = []
+        previous = taken = 0
+        for index, seat in enumerate(contenders):
+            level = self.players[seat].contributed
+            if level == previous:
+                continue
+            amount = 0
+            while taken < len(contributions) and contributions[taken] <= level:
+                amount += contributions[taken] - previous
+                taken += 1
+            amount += (len(contributions) - taken) * (level - previous)
+            pots.append((amount, contenders[index:]))
+            previous = level
+        # Chips folded above every contender's stake go to the last pot
+        if pots and taken < len(contributions):
+            amount, eligible = pots[-1]
+            pots[-1] = (amount + sum(contributions[taken:]) - previous * (len(contributions) - taken), eligible)
+        return pots
+
     def determine_winner(self):
-        SUITS_RANKING = ["♠","♥","♦","♣"]
-        active_players = [player for player in self.players if player['money'] > 0 and player['decision']!='fold'] 
-        best_hands = [(player['name'], self.evaluate_hand(player['hand'], self.community_cards)) for player in active_players]
-        best_hands.sort(key=lambda x: (self.HAND_RANKINGS.index(x[1][0]), x[0]))
-        tied_players = [player for player in best_hands if player[1][0] == best_hands[0][1][0]]
-
-        if len(tied_players) > 1:  # There is a tie
-            # Compare high cards
-            values = []
-            suits = []
-            tied_array = []
-            
-            i = 0
-            for player in active_players:
-                for t in tied_players:
-                    if t[0] == player['name']:
-                        tied_array.append(t)
-                        values.append([card.__int__() for card in player['hand']])
-                        suits.append([card._suit for card in player['hand']])
-
-            i = 0
-            for pair in values:
-                suits[i].remove(suits[i][pair.index(min(pair))])
-                pair.remove(min(pair))
-                i+=1
-
-            high_cards_values = values
-            
-            new_values = []
-            for arr in values:
-                for val in arr:
-                    new_values.append(val)
-
-            count_dict = Counter(new_values)
-            tied_index = []
-            for num, count in count_dict.items():
-                if count > 1 and num==max(new_values): # tied inside high cards
-                    max_value = max(new_values)
-                    for i in range(len(values)):
-                        if values[i][0] == max_value:    
-                            tied_index.append(i)
-                    
-                    updated_suits = sorted(suits, key=lambda x: SUITS_RANKING.index(x[0]))
-                    original_indice = [i for i, suit in enumerate(suits) if updated_suits[0][0]==suit[0]]
-
-                    for i in range(len(tied_array)):
-                        if i not in tied_index:
-                            del tied_array[i]
-                    player_name = (' and '.join(player[0] for player in tied_array))#tied_array[tied_index[original_indice[0]]][0]
-                    hand_type =  suits[tied_index[original_indice[0]]][0] #suit[0][0]
-                    hand_values = values[tied_index[original_indice[0]]][0] #values[0][0]
-                    winner = (player_name, (hand_type, hand_values))
-                    #self.get_player_by_name(player_name)['money'] += self.get_pot()
-                    return winner
-
-            if len(values) >2:
-                max_value = max(values)
-                tied_index = []
-                for i in range(len(values)):
-                    if values[i] == max_value:
-                        winner = tied_players[high_cards_values.index(max(high_cards_values))]
-                        tied_index.append(values.index(values[i]))   
-                        player_name = tied_array[tied_index[0]][0]
-                        hand_type = values[tied_index[0]][0]
-                        hand_values = suits[tied_index[0]][0]
-                        winner = (player_name, (hand_type, hand_values))
-                        self.get_player_by_name(player_name)['money'] += self.get_pot()
-
-                        return winner
-
-            if values[0]>values[1]:  
-                winner_info = tied_array[0]
-                player_name = winner_info[0]
-
-                hand_type = suits[0][0]
-                hand_values = values[0][0]
-                winner = (player_name, (hand_type, hand_values))
-
-                # Distribute money to winner
-                self.get_player_by_name(player_name)['money'] += self.get_pot()
-
-                return winner
-            elif values[1]>values[0]:
-                winner_info = tied_array[1]
-                player_name = winner_info[0]
-                hand_type = suits[1][0]
-                hand_values = values[1][0]
-                winner = (player_name, (hand_type, hand_values))
-
-                # Distribute money to winner
-                self.get_player_by_name(player_name)['money'] += self.get_pot()
-
-                return winner
-            else:
-                # Find the player with the highest high card
-                winner = tied_players[high_cards_values.index(max(high_cards_values))]
-                player_name = (' and '.join(player[0] for player in tied_players))
-                hand_type = winner[1][0]
-                hand_values = winner[1][1]
-                winner = (player_name, (hand_type, hand_values))
-                game.set_tie_flag(1)
+        seats = sorted(self.in_hand)
+        if not seats:  # nobody left to show down: hand the chips back
+            for player in self.players:
+                player.money += player.contributed
+            return ('Nobody', ('no showdown', []))
+        strengths, winners = self.showdown_strengths([self.players[seat].hand for seat in seats])
+        best = strengths[winners[0]]
+        player_name = ' and '.join(self.players[seats[i]].name for i in winners)
+        winner = (player_name, (hand_name(best), hand_ranks(best)))
+        if len(winners) > 1:
+            self.set_tie_flag(1)
+
+        # Each pot goes to the best hands among the seats that can win it, in
+        # whole chips; odd chips go to the earliest seats
+        strength = dict(zip(seats, strengths))
+        for amount, eligible in self.side_pots():
+            top = max(strength[seat] for seat in eligible)
+            takers = sorted(seat for seat in eligible if strength[seat] == top)
+            share, odd = divmod(amount, len(takers))
+            for i, seat in enumerate(takers):
+                self.players[seat].money += share + (i < odd)
+
+        return winner
+    
+    def snapshot(self, events=()):
+        return TableSnapshot(self, events)
 
-                #return money because of tie
-                split_amount = self.get_pot()/len(active_players)
-                for player in active_players:
-                    player['money']+=split_amount
+    def step(self, raise_amount=None):
+        # Advance the hand by one action (or the showdown once the river is done)
+        if self.round <= 5:
+            self.betting_round(raise_amount)
+        else:
+            self.finish_hand()
 
-                return winner
+    def _commit(self, player, amount):
+        # Move chips from a stack into the pot; short stacks go all-in
+        amount = min(amount, player.money)
+        player.money -= amount
+        player.bet += amount
+        player.contributed += amount
+        self.pot += amount
 
-        self.get_player_by_name(best_hands[0][0])['money']+=self.get_pot()
+    def first_bet(self):
+        # Blinds: the first seat with chips posts the small one, the last seat the big one
+        seats = self.get_active_seats()
+        small, big = seats[0], seats[-1]
+        self._commit(small, self.small_blind)
+        self._commit(big, self.big_blind)
+        self.current_bet = max(small.bet, big.bet)
+        self.last_aggressor = big.seat
+
+    def start_street(self):
+        for player in self.players:
+            player.bet = 0
+        self.current_bet = 0
+        self.min_raise = self.big_blind
+        self.last_aggressor = None
+        self.pending = set(self.active_seats)
+        self.current_player_index = 0
 
-        # No tie, return the winner
-        return best_hands[0]
-    
-    # game and betting logic for before dealing 3 community cards
-    def decision_cycle(self, raise_amount):
-
-        self.active_players = [player for player in self.active_players if player['money'] > 0 and player['decision'] != 'fold']  # Filter out players with no money
-        gui.set_submitted_flag(0)
-
-        while len(self.active_players) >= 2:
-            current_player = self.active_players[self.current_player_index]  
-            max_bet = max(player['bet'] for player in self.players)
-
-            print(f"{current_player['name']}'s hand: {current_player['hand']}")
-     
-            current_player['decision'], current_player['bet'] = self.get_player_decision()
-            print(current_player['name'], 'start', current_player['decision'])
-
-            if current_player['decision'] == 'fold':
-                current_player['money'] -= current_player['bet']
-                current_player['bet'] = 0
-            elif current_player['decision'] == 'call':
-                self.pot += abs(self.total_raise_amount - current_player['bet'])
-                current_player['money'] -= abs(self.total_raise_amount - current_player['bet'])
-                current_player['bet'] = max_bet
-            elif current_player['decision'] == 'raise':
-                self.total_raise_amount += raise_amount  # Update the total raise amount
-                current_player['bet'] = self.total_raise_amount
-                self.pot += current_player['bet']
-                current_player['money'] -= current_player['bet']
-            elif current_player['decision'] == 'hold':
-                # while current_player['bet'] == 10:
-                #     current_player['decision'], current_player['bet'] = self.get_player_decision()
-                #     current_player['bet'] = 20
-                #     break
-                # current_player['money']-=current_player['bet']
-                pass
-                           
-            max_bet = max(player['bet'] for player in self.active_players)
-            if all(player['bet'] == max_bet for player in self.active_players) and self.get_index()+1==len(self.active_players):
-                gui.increment_round()
-                gui.set_submitted_flag(0)
-                self.deal_community_cards(3)
-                self.current_player_index = 0
-                self.total_raise_amount = 0
-                for player in self.active_players:
-                    player['bet'] = 0
-                break
-            
-            # if all(player['bet'] == max_bet for player in active_players):
-            #     for player in active_players:
-            #         player['bet'] = 0
- 
-
-            if self.current_player_index+1 == len(self.active_players):
-                self.current_player_index = 0
-                break
-            
-            if current_player['decision']!='fold':
-                self.increment_current_player_index()
-            break
-
-        self.active_players = [player for player in self.active_players if player['money'] > 0 and player['decision'] != 'fold']  # Filter out players with no money
-        if len(self.active_players)==1:
-            for i in range(5-len(self.community_cards)):
-                self.deal_community_cards(1)
-            gui.update_community_cards_display()
-            gui.end_round()
-            game.get_player_by_name(game.get_active_players()[game.current_player_index])['decision'] = None
+    def new_hand(self, hand_number=None):
+        # Returns False, after a 'game_over' event, once fewer than two seats have chips
+        for player in self.players:
+            player.decision = ''
+        if len(self.active_seats) < 2:
+            names = self.get_active_players()
+            self.emit('game_over', winner=names[0] if names else None)
+            return False
+        self.hand_number = self.hand_number + 1 if hand_number is None else hand_number
+        self.round = 1
+        self.community_cards = []
+        if self.dealer is not None:
+            deck_seed, bots_seed = self.dealer.hand_seeds(self.hand_number)
+            self.deck_rng.seed(deck_seed)
+            self.rng.seed(bots_seed)
+        self.deck.reset(reorder=self.dealer is not None)
+        for player in self.players:
+            self.deal_hands(player, num_cards=2)
+            player.contributed = 0
+        self.in_hand = set(self.active_seats)
+        self.pot = 0
+        self.start_street()
+        self.first_bet()
+        self.pending = set(self.active_seats)  # the blinds may have put someone all-in
+        if not self.pending:  # they covered every stack: no betting, straight to the showdown
+            self.run_out()
+            self.round = 6
+        return True
+
+    def finish_hand(self):
+        winner = self.determine_winner()
+        tie = self.get_tie_flag() == 1
+        self.set_tie_flag(0)
+        self.emit('showdown', winner=winner, tie=tie)
+        active_players = self.get_active_players()
+        if self.current_player_index < len(active_players):
+            self.get_player_by_name(active_players[self.current_player_index]).decision = None
+        self.current_player_index = 0
+        self.emit('hand_over', winner=winner)
+
+    # One action of the current street, preflop or postflop. The street state
+    # (current_bet, min_raise, last_aggressor, pending) is updated in place, so
+    # the street is over exactly when no seat is pending.
+    def betting_round(self, raise_amount=None):
+        if raise_amount is not None:
+            self.raise_amount = raise_amount
+        if not self.pending:  # nobody left who can act, e.g. all-in on the blinds
+            self.end_street()
+            return
+
+        seats = self._active()[0]
+        if self.current_player_index >= len(seats):
             self.current_player_index = 0
-            gui.restart_game()
+        player = self.players[seats[self.current_player_index]]
+        if self.verbose:
+            print(f"{player.name}'s hand: {player.hand}")
+
+        player.decision, _ = self.get_player_decision(player)
+        if self.verbose:
+            print(player.name, player.decision)
+        self.emit('action', player=player, decision=player.decision)
+
+        if player.decision == 'fold':
+            self.in_hand.discard(player.seat)
+        elif player.decision == 'raise':
+            self._commit(player, self.current_bet + max(self.raise_amount, self.min_raise) - player.bet)
+            if player.bet > self.current_bet:
+                self.min_raise = max(self.min_raise, player.bet - self.current_bet)
+                self.current_bet = player.bet
+                self.last_aggressor = player.seat
+                self.pending = set(self.active_seats)  # everyone else acts again
+        else:  # call, or hold (a check, which calls when there is a bet to face)
+            self._commit(player, self.current_bet - player.bet)
+        self.pending.discard(player.seat)
+
+        if len(self.in_hand) <= 1:  # everyone else folded
+            self.run_out()
+            self.finish_hand()
+        elif not self.pending:
+            self.end_street()
+        else:
+            self.current_player_index = self._active()[0].index(self._next_pending(player.seat))
+
+    def _next_pending(self, seat):
+        num_seats = len(self.players)
+        for offset in range(1, num_seats + 1):
+            if (seat + offset) % num_seats in self.pending:
+                return (seat + offset) % num_seats
+
+    def end_street(self):
+        self.round += 1
+        self.emit('street_complete', round=self.round)
+        if self.round > 4:
+            self.round = 6  # river betting is done, step() plays the showdown
+            return
+        self.deal_community_cards(3 if self.round == 2 else 1)
+        self.emit('community_cards')
+        self.start_street()
+        if len(self.pending) < 2:  # at most one stack can still bet: no more betting
+            self.run_out()
+            self.round = 6
+
+    def run_out(self):
+        if len(self.community_cards) < 5:
+            self.deal_community_cards(5 - len(self.community_cards))
+            self.emit('community_cards')
+
+    def decision_cycle(self, raise_amount=None):
+        # Kept for callers of the old preflop-only entry point
+        self.betting_round(raise_amount)
+
+class TableSnapshot:
+    # Read-only copy of a PokerGame with the accessors the GUI uses, so the
+    # window can draw while the engine runs on another thread (engine_thread.py).
+    # events holds the (event, data) pairs emitted by the step that produced it.
+    __slots__ = ('players', 'seat_index', 'community_cards', 'pot', 'round', 'current_player_index', 'tie_flag',
+                 'active_names', 'in_hand', 'events')
+
+    def __init__(self, game, events=()):
+        self.players = tuple(MappingProxyType(dict(player, hand=tuple(player.hand))) for player in game.players)
+        self.seat_index = dict(game.seat_index)
+        self.community_cards = tuple(game.community_cards)
+        self.pot = game.pot
+        self.round = game.round
+        self.current_player_index = game.current_player_index
+        self.tie_flag = game.tie_flag
+        self.active_names = tuple(game.get_active_players())
+        self.in_hand = frozenset(game.in_hand)
+        self.events = tuple(events)
 
+    def get_active_players(self):
+        return self.active_names
+
+    def get_player_by_name(self, player_name):
+        seat = self.seat_index.get(player_name)
+        return None if seat is None else self.players[seat]
+
+    def get_money(self, player_name):
+        player = self.get_player_by_name(player_name)
+        return None if player is None else player['money']
+
+    def get_bet(self, player_name):
+        player = self.get_player_by_name(player_name)
+        return None if player is None else player['bet']
+
+    def get_pot(self):
+        return self.pot
+
+    def get_tie_flag(self):
+        return self.tie_flag
+
+
+CHIP_DENOMINATIONS = (1000, 500, 100, 50, 10, 5)
+CHIP_SIZE = 120
+CHIP_GAP = 10
+
+
+@lru_cache(maxsize=256)
+def chip_layout(total):
+    # ((denomination, count, x), ...) for each column of chips that makes up total
+    columns = []
+    for denomination in CHIP_DENOMINATIONS:
+        count, total = divmod(total, denomination)
+        if count:
+            columns.append((str(denomination), count))
+    x = 400 - CHIP_SIZE * len(columns) / 2
+    layout = []
+    for key, count in columns:
+        layout.append((key, count, x))
+        x += CHIP_SIZE + CHIP_GAP
+    return tuple(layout)
 
-            
-    def first_bet(self):
-        # Input small blind amount
-        small_blind_amount = 10
-
-        # Input big blind amount
-        big_blind_amount = 20
-        self.current_highest_bet = big_blind_amount
-
-        # Set small blind player (Player1)
-        self.players[0]['bet'] = small_blind_amount
-        self.current_highest_bet = small_blind_amount
-
-        # Set big blind player (Player2)
-        self.players[-1]['bet'] = big_blind_amount
-        self.current_highest_bet = big_blind_amount
-
-        # Display initial pot
-        self.pot = small_blind_amount + big_blind_amount
-        self.get_player_by_name('Player1')['money']-=small_blind_amount
-        self.players[-1]['money'] -= big_blind_amount
-        #self.get_player_by_name('Player'+ str(len(self.players)-1))['money']-=big_blind_amount
-
-    # game and betting logic for after community cards are distributed
-    def betting_round(self, raise_amount):
-        self.active_players = [player for player in self.active_players if player['money'] > 0 and player['decision'] != 'fold']  # Filter out players with no money
-
-        gui.set_submitted_flag(0)
-
-        while len(self.active_players) >= 2:
-
-            current_player = self.active_players[self.current_player_index]
-            print(self.current_player_index)
-            max_bet = max(player['bet'] for player in self.active_players)
-            current_player['decision'], current_player['bet'] = self.get_player_decision()
-            print(current_player['name'], current_player['decision'])
-
-            if current_player['decision'] == 'fold':
-                current_player['money'] -= current_player['bet']
-                current_player['bet'] = 0
-            elif current_player['decision'] == 'call':
-                self.pot += abs(self.total_raise_amount - current_player['bet'])
-                current_player['money'] -= abs(self.total_raise_amount - current_player['bet'])
-                current_player['bet'] = max_bet
-            elif current_player['decision'] == 'raise':
-                self.total_raise_amount += raise_amount  # Update the total raise amount
-                current_player['bet'] = self.total_raise_amount 
-                self.pot += current_player['bet']
-                current_player['money'] -= current_player['bet']
-            elif current_player['decision'] == 'hold':
-                current_player['money']-=current_player['bet']
-               
-            max_bet = max(player['bet'] for player in self.active_players)
-            if all(player['bet'] == max_bet for player in self.active_players) and self.get_index()+1==len(self.active_players):
-                gui.increment_round()
-                gui.set_submitted_flag(0)
-                if gui.get_round()==5:
-                    gui.set_round(6)
-                else:
-                    self.deal_community_cards(1)
-                    gui.update_community_cards_display()
-                    self.current_player_index = 0
-                    self.total_raise_amount = 0
-                    for player in self.active_players:
-                        player['bet'] = 0
-                break
- 
-            if self.current_player_index+1 == len(self.active_players):
-                self.current_player_index = 0
-                break
-
-            if current_player['decision']!='fold':
-                self.increment_current_player_index()
-            break
-
-        self.active_players = [player for player in self.active_players if player['money'] > 0 and player['decision'] != 'fold']  # Filter out players with no money
-
-        if len(self.active_players)==1:
-            for i in range(5-len(self.community_cards)):
-                self.deal_community_cards(1)
-            gui.update_community_cards_display()
-            gui.end_round()
-            game.get_player_by_name(game.get_active_players()[game.current_player_index])['decision'] = None
-            self.current_player_index = 0
-            gui.restart_game()
-
-class BackgroundFrame(tk.Frame):
-    def __init__(self, master, image_path):
-        super().__init__(master)
-        self.image = Image.open(image_path)
-        self.img_copy = self.image.copy()
-        self.background_image = ImageTk.PhotoImage(self.image)
-        self.background_label = tk.Label(self, image=self.background_image)
-        self.background_label.place(x=0, y=0, relwidth=1, relheight=1)
-        self.background_label.bind('<Configure>', self.resize_image)
-
-    def resize_image(self, event):
-        new_width, new_height = event.width, event.height
-        self.image = self.img_copy.resize((new_width, new_height))
-        self.background_image = ImageTk.PhotoImage(self.image)
-        self.background_label.configure(image=self.background_image)
 
 class PokerGameGUI:
     SUIT_MAPPING = {
@@ -473,8 +496,30 @@ class PokerGameGUI:
         '♥': 'Hearts',
         '♦': 'Diamonds'
     }
-    def __init__(self, game):
+    CARD_IMAGE_CACHE = 24  # PhotoImages kept per size, well above the 7 cards on screen
+    CHIP_STEP = CHIP_SIZE // 10  # vertical offset between chips in a column
+    CHIP_COLLAPSE = 8  # taller columns are drawn as one pre-composited image
+    # Input states. Button callbacks never wait: each one advances the engine
+    # by at most one step and returns to the mainloop.
+    AWAIT_ACTION = 'action'  # a Fold/Call/Hold/Raise click is expected
+    AWAIT_AMOUNT = 'amount'  # Raise was clicked, the amount comes from Submit
+    HAND_OVER = 'hand_over'  # showdown is on screen, restart_game is pending
+    ENGINE_BUSY = 'busy'  # threaded mode: an action was posted, its snapshot is pending
+    POLL_INTERVAL = 16  # ms between drains of the engine thread's updates
+    EQUITY_POLL_INTERVAL = 50  # ms between checks for new win probabilities
+
+    def __init__(self, game, threaded=False):
+        load_gui()
         self.game = game
+        # With threaded=True the engine runs on its own thread and the window
+        # only ever reads the TableSnapshots it sends back (self.view)
+        self.engine = None
+        if threaded:
+            from engine_thread import EngineThread
+            self.engine = EngineThread(game)
+        else:
+            self.game.decision_provider = self.get_decision
+            self.game.add_listener(self.on_game_event)
         self.root = tk.Tk()
         self.root.title('Poker Game')
         self.root.geometry("1200x1200")
@@ -499,9 +544,11 @@ class PokerGameGUI:
         self.submit_button = tk.Button(self.root, text="Submit", command=self.process_input)
         self.submit_button.pack_forget()
 
-        # Create an IntVar to act as a flag for submission
-        self.submitted_flag = tk.IntVar(self.root,value=0)
-        self.hold_flag = tk.IntVar(self.root,value=0)
+        self.state = self.AWAIT_ACTION
+        self.live_equity = LiveEquity()
+        self.equity_key = None
+        self.equity_names = []
+        self.equity_polling = False
 
         self.card_images = self.load_card_images()
         self.token_images = self.load_token_images()
@@ -509,15 +556,55 @@ class PokerGameGUI:
         self.setup_gui()
         
         self.winner_label.pack()
-        self.game.first_bet()
+        self.view = self.game
+        if self.engine is not None:
+            # The engine thread deals the first hand; its snapshot enables the buttons
+            self.view = self.game.snapshot()
+            self.state = self.ENGINE_BUSY
+            self.engine.start()
+            self.engine.post('new_hand')
+            self.root.after(self.POLL_INTERVAL, self.poll_engine)
+        else:
+            self.deal_hand()
         self.update_bets_and_pot()
-        self.deal_initial_cards()
-        self.update_hand_display()
-        self.update_tokens_display()
+        # Cards are drawn once the window is up; the sprite sheets are
+        # refreshed for the next launch after that
+        self.root.after_idle(self.update_hand_display)
+        self.root.after_idle(self.update_tokens_display)
+        self.root.after_idle(self.update_equity_display)
+        self.root.after_idle(self.card_images.refresh_cache)
+        self.root.after_idle(self.token_images.refresh_cache)
         
 
+    # The street counter lives in the engine; the GUI reads it through here
+    @property
+    def round(self):
+        return self.game.round
+
+    @round.setter
+    def round(self, value):
+        self.game.round = value
+
     def set_round(self, value):
         self.round = value
+
+    def get_decision(self, game, player):
+        return self.enable_button(), None
+
+    def on_game_event(self, event, data):
+        if event == 'community_cards':
+            self.update_community_cards_display()
+        elif event == 'showdown':
+            self.end_round(data['winner'], data['tie'])
+        elif event == 'hand_over':
+            # Let the engine call that finished the hand return before the dialog
+            self.state = self.HAND_OVER
+            self.root.after_idle(self.restart_game)
+        elif event == 'game_over':
+            self.state = self.HAND_OVER
+            self.disable_user_interaction()
+            messagebox.showinfo("Game Over", f"{data['winner']} has all the chips.")
+            self.root.destroy()
     
     def add_player_dialog(self):
         while True:
@@ -550,27 +637,32 @@ class PokerGameGUI:
         parent.option_add("*Checkbutton.Background", "white")
         parent.option_add("*Checkbutton.Foreground", "green")
 
+    def deal_hand(self):
+        # Synchronous mode: start the next hand, False once the game is over.
+        # When the blinds put everyone all-in there is nothing to ask for.
+        if not self.game.new_hand():
+            return False
+        self.state = self.AWAIT_ACTION
+        if self.game.round > 5:
+            self.game.step()
+        return True
+
     def restart_game(self):
         
         result = messagebox.askyesno("Restart Game", "Do you want to restart the game?")
         if result:
-            
-            self.set_round(1)
-            game.community_cards = []
-            game.deck = Deck()
-            
-            self.deal_initial_cards()
-            game.active_players = game.players 
-            for player in game.active_players:
-                player['decision'] = ''
             self.call_button.config(state=tk.NORMAL)
             self.fold_button.config(state=tk.NORMAL)
             self.winner_label.config(text="")
-            game.first_bet()
-            
-            self.update_hand_display()
-            self.update_bets_and_pot()
-            self.update_tokens_display()
+
+            if self.engine is not None:
+                self.state = self.ENGINE_BUSY
+                self.engine.post('new_hand')  # displays refresh when its snapshot arrives
+            elif self.deal_hand():
+                if self.state == self.AWAIT_ACTION:
+                    self.refresh_displays()
+            else:
+                return  # game over, the window is already closed
             
             messagebox.showinfo("Game Restarted", "The game has been restarted.")
         else:
@@ -598,59 +690,55 @@ class PokerGameGUI:
         self.raise_button.config(state=tk.DISABLED)
         self.fold_button.config(state=tk.DISABLED)
 
-    def end_round(self):
+    def end_round(self, winner=None, tie=None):
         self.disable_user_interaction()
-
-        winner = game.determine_winner()
+        self.live_equity.cancel()
+        self.equity_key = None
+        self.equity_label.config(text="")
+
+        if winner is None:
+            winner = self.game.determine_winner()
+            tie = self.game.get_tie_flag() == 1
+            self.game.set_tie_flag(0)
         self.winner_label.config(text=f'{winner[0]}')
 
-        if game.get_tie_flag()==1:
+        if tie:
             self.winner_label.config(text=f"Tie between {winner[0]} with {winner[1]}")#place(x=640, y=850) 
-            game.set_tie_flag(0)
         else:
             self.winner_label.config(text=f"Winner: {winner[0]} with {winner[1]}")#place(x=640, y=850) 
-        self.root.update()
 
     def process_input(self):
+        if self.state != self.AWAIT_AMOUNT:
+            return
         try:
             # Get the entered number from the Entry widget
             entered_number = int(self.number_entry.get())
-            while entered_number > game.get_player_by_name(game.get_active_players()[game.current_player_index])['money']:
-                self.number_entry.pack_forget()
-                self.submit_button.pack_forget()
-                self.number_entry = tk.Entry(self.root, width=10)
-                self.submit_button = tk.Button(self.root, text="Submit", command=self.process_input)
-
-                # Pack the widgets
-                self.number_entry.pack(pady=5)
-                self.submit_button.pack()
-                entered_number = int(self.number_entry.get())
-            self.result_label.config(text="")
-
-            self.raise_amount = entered_number
-
-            self.submitted_flag.set(1)
-
         except ValueError:
             # Handle the case where the entered value is not a valid integer
             self.result_label.config(text="Invalid input. Please enter a number.")
+            return
+
+        money = self.current_player()['money']
+        if entered_number > money:
+            self.result_label.config(text=f"You only have ${money}.")
+            return
+        self.result_label.config(text="")
+
+        self.raise_amount = entered_number
+        self.submit_action('raise')
 
     def run(self):
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.live_equity.close()
 
     def load_card_images(self):
-        card_images = {}
-        for suit in ['Hearts', 'Diamonds', 'Clubs', 'Spades']:
-            for rank in ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']:
-                filename = f'{rank}_of_{suit}.png'  
-                # path = os.path.join('/Users/chloesun/Downloads/playing-cards-master', filename)
-                path = os.path.join(os.path.dirname(__file__), 'playing-cards-master', f'{rank}_of_{suit}.png')
-                image = Image.open(path)
-                image = image.resize((70, 120), Image.LANCZOS)
-
-                photo = ImageTk.PhotoImage(image)
-                card_key = f"{rank}_of_{suit}"
-                card_images[card_key] = photo  
+        # Nothing is decoded here: each card is loaded the first time it is shown
+        names = [f'{rank}_of_{suit}' for suit in ['Hearts', 'Diamonds', 'Clubs', 'Spades']
+                 for rank in ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']]
+        path = os.path.join(os.path.dirname(__file__), 'playing-cards-master')
+        card_images = LazySprites(path, names, (70, 120), capacity=self.CARD_IMAGE_CACHE)
 
         # Store card_images at the class level
         self.card_images = card_images
@@ -658,17 +746,9 @@ class PokerGameGUI:
         return card_images
     
     def load_token_images(self):
-        token_images = {}
-        for value in ['5', '10', '50', '100', '500', '1000']:
-            filename = f'{value}.png'  
-            # path = os.path.join('/Users/chloesun/Downloads/playing-cards-master', filename)
-            path = os.path.join(os.path.dirname(__file__), 'chips-pics', filename)
-            image = Image.open(path)
-            image = image.resize((120, 120), Image.LANCZOS)
-
-            photo = ImageTk.PhotoImage(image)
-            card_key = f"{value}"
-            token_images[card_key] = photo  
+        names = ['5', '10', '50', '100', '500', '1000']
+        path = os.path.join(os.path.dirname(__file__), 'chips-pics')
+        token_images = LazySprites(path, names, (120, 120), capacity=len(names))
 
         # Store card_images at the class level
         self.token_images = token_images
@@ -694,12 +774,16 @@ class PokerGameGUI:
         self.raise_button.config(state=tk.DISABLED)
 
         self.player_hand_label.pack()
+        self.equity_label = tk.Label(self.root, text="")
+        self.equity_label.pack()
         self.player_bet_label.pack()
         self.player_money_label.pack()
         self.player_tokens_frame = tk.Frame(self.root, bg="green")
         self.player_tokens_frame.pack(fill='both', expand=True)
         self.canvas = tk.Canvas(self.player_tokens_frame, width=800, height=150, bg='green')
         self.canvas.pack()
+        self.chip_items = []
+        self.shown_chip_layout = None
         
         self.player_hand_frame = tk.Frame(self.root) #frames to hold card images
         self.player_hand_frame.pack()
@@ -712,121 +796,126 @@ class PokerGameGUI:
         self.raise_button.pack(side = tk.LEFT)
         self.call_button.pack(side = tk.LEFT)
         self.hold_button.pack(side = tk.LEFT)
+        self.create_card_slots()
 
-    def get_submitted_flag(self):
-        return self.submitted_flag.get()
     
+    def current_player(self):
+        # The player to act; when nobody can act (all-in) the first seat still in the hand
+        names = self.view.get_active_players()
+        if self.view.current_player_index < len(names):
+            return self.view.get_player_by_name(names[self.view.current_player_index])
+        return self.view.players[min(self.view.in_hand, default=0)]
+
     def update_bets_and_pot(self):
         # Update the text of the labels with the current bet and pot values
-        self.player_bet_label.config(text=f"{game.get_player_by_name(game.get_active_players()[game.current_player_index])['name']}'s Bet: ${game.get_bet(game.get_player_by_name(game.get_active_players()[game.current_player_index])['name'])}") 
-
-        self.player_money_label.config(text=f"{game.get_player_by_name(game.get_active_players()[game.current_player_index])['name']}'s Money: ${game.get_money(game.get_player_by_name(game.get_active_players()[game.current_player_index])['name'])}")
-        self.pot_label.config(text=f"Pot: ${game.get_pot()}")
-        self.player_turn_label.config(text=f"{game.get_player_by_name(game.get_active_players()[game.current_player_index])['name']}'s turn")
+        player = self.current_player()
+        self.player_bet_label.config(text=f"{player['name']}'s Bet: ${player['bet']}")
+        self.player_money_label.config(text=f"{player['name']}'s Money: ${player['money']}")
+        self.pot_label.config(text=f"Pot: ${self.view.get_pot()}")
+        self.player_turn_label.config(text=f"{player['name']}'s turn")
 
     def Fold(self):
-        self.action = 'fold'
-        self.process_call()
-        self.process_user_input()   
-    
-    def process_call(self):
-        self.submitted_flag.set(1)
+        self.submit_action('fold')
 
-    def Raise(self):
-        self.raise_amount = 0
-        self.action = 'raise'
+    def Call(self):
+        self.submit_action('call')
 
-        self.number_entry = tk.Entry(self.root, width=10)
-        self.submit_button = tk.Button(self.root, text="Submit", command=self.process_input)
+    def Hold(self):
+        self.submit_action('hold')
 
-        # Pack the widgets
+    def Raise(self):
+        if self.state != self.AWAIT_ACTION:
+            return
+        self.state = self.AWAIT_AMOUNT
+        self.number_entry.delete(0, tk.END)
         self.number_entry.pack(pady=5)
         self.submit_button.pack()
+        self.result_label.pack()
 
-        # Configure the Submit Button to call process_input when clicked
-        self.submit_button.configure(command=self.process_input)
-
-        # Delete existing content in Entry widget
-        self.number_entry.delete(0, tk.END)
-
-        # Call the function to process user input
-        self.process_user_input()
-
-    def process_user_input(self,*args):
-        if self.round==1:
-            if self.get_submitted_flag() == 0:
-                self.root.wait_variable(self.submitted_flag)
-
-            self.number_entry.destroy()
-            self.submit_button.destroy() #player 1 keep changing deck
-
-            game.decision_cycle(self.raise_amount)
-            self.update_bets_and_pot()
-            if self.round!=5:
-                self.update_hand_display()
-                self.update_tokens_display()
-        elif self.round==2:
-            if self.get_submitted_flag() == 0:
-                self.root.wait_variable(self.submitted_flag)
-            self.number_entry.destroy()
-            self.submit_button.destroy()
-            
-            game.betting_round(self.raise_amount)
-            self.update_hand_display()
-            self.update_tokens_display()
-            self.update_bets_and_pot()
-            
-        elif self.round==3:
-            if self.get_submitted_flag() == 0:
-                self.root.wait_variable(self.submitted_flag)
-
-            self.number_entry.destroy()
-            self.submit_button.destroy()
-
-            game.betting_round(self.raise_amount)
-            gui.update_hand_display()
-            self.update_tokens_display()
-            self.update_bets_and_pot()
-        elif self.round==4:
-            if self.get_submitted_flag() == 0:
-                self.root.wait_variable(self.submitted_flag)
-
-            self.number_entry.destroy()
-            self.submit_button.destroy()
-            
-            game.betting_round(self.raise_amount)
-            gui.update_hand_display()
-            self.update_tokens_display()
-            self.update_bets_and_pot()
-        elif self.round==5:
-            if self.get_submitted_flag() == 0:
-                self.root.wait_variable(self.submitted_flag)
-
-            self.number_entry.destroy()
-            self.submit_button.destroy()
-            
-            game.betting_round(self.raise_amount)
-            gui.update_hand_display()
-            self.update_tokens_display()
-            self.update_bets_and_pot()
+    def submit_action(self, action):
+        # Hand one decision to the engine, which plays it and returns. Clicks
+        # while the engine is busy or the hand is over are dropped.
+        if self.state not in (self.AWAIT_ACTION, self.AWAIT_AMOUNT):
+            return
+        self.number_entry.pack_forget()
+        self.submit_button.pack_forget()
+        self.result_label.pack_forget()
+        self.state = self.AWAIT_ACTION
+        self.action = action
+        raise_amount = self.raise_amount if action == 'raise' else None
+
+        if self.engine is not None:
+            self.state = self.ENGINE_BUSY
+            self.engine.post('action', action, raise_amount)
+            return
+
+        self.game.step(raise_amount)
+        if self.state == self.AWAIT_ACTION and self.game.round > 5:
+            self.game.step()  # river betting is over, nothing left to ask for
+
+        if self.state == self.AWAIT_ACTION:
+            self.refresh_displays()
+
+    def poll_engine(self):
+        # Threaded mode: apply everything the engine thread sent since the last poll
+        self.root.after(self.POLL_INTERVAL, self.poll_engine)
+        while True:
+            try:
+                update = self.engine.updates.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(update, BaseException):
+                raise update  # the engine thread failed; surface it in Tk's error handler
+            self.apply_snapshot(update)
+
+    def apply_snapshot(self, snapshot):
+        self.view = snapshot
+        for event, data in snapshot.events:
+            self.on_game_event(event, data)
+        if self.state == self.ENGINE_BUSY:
+            self.state = self.AWAIT_ACTION
+            self.enable_button()
+            self.refresh_displays()
+
+    def refresh_displays(self):
+        self.update_hand_display()
+        self.update_tokens_display()
+        self.update_bets_and_pot()
+        self.update_equity_display()
+
+    def update_equity_display(self):
+        # Start a new background estimate when the board or the hands still in change.
+        # All-in seats have no chips left but still contest the pot, so go by in_hand.
+        players = [self.view.players[seat] for seat in sorted(self.view.in_hand)]
+        names = [player['name'] for player in players]
+        hands = [tuple(player['hand']) for player in players]
+        key = (tuple(self.view.community_cards), tuple(names), tuple(hands))
+        if key == self.equity_key:
+            return
+        self.equity_key = key
+        if len(hands) < 2:
+            self.live_equity.cancel()
+            self.equity_label.config(text="")
+            return
+
+        self.equity_names = names
+        self.live_equity.request(hands, self.view.community_cards)
+        self.equity_label.config(text="Win probability: computing...")
+        if not self.equity_polling:
+            self.equity_polling = True
+            self.root.after(self.EQUITY_POLL_INTERVAL, self.poll_equity)
+
+    def poll_equity(self):
+        update = self.live_equity.poll()
+        if update is not None:
+            equities, _, finished = update
+            text = ", ".join(f"{name} {value:.1%}" for name, value in zip(self.equity_names, equities))
+            self.equity_label.config(text=f"Win probability: {text}" + ("" if finished else " (refining)"))
+        if self.live_equity.pending:
+            self.root.after(self.EQUITY_POLL_INTERVAL, self.poll_equity)
         else:
-            gui.end_round()
-            game.get_player_by_name(game.get_active_players()[game.current_player_index])['decision'] = None
-            self.current_player_index = 0
-            gui.restart_game()
-
+            self.equity_polling = False
 
-    def Call(self):
-        self.action = 'call'
-        self.process_call()
-        self.process_user_input()   
-
-    def Hold(self):
-        self.action = 'hold'
-        self.process_call()
-        self.process_user_input()
-        
-    
     def enable_button(self):  
         self.raise_button.config(state = tk.NORMAL)
         self.call_button.config(state = tk.NORMAL)
@@ -834,54 +923,60 @@ class PokerGameGUI:
         self.hold_button.config(state = tk.NORMAL)
         return self.action
 
-    def set_submitted_flag(self, value):
-        self.submitted_flag.set(value)
-    
-    def update_community_cards_display(self):
-        for element in self.community_frame.winfo_children():
-            element.destroy()
+    def create_card_slots(self):
+        # Fixed widgets for the shown hand and board. The update_* methods only
+        # reconfigure the slots whose card or text changed; nothing is destroyed.
+        self.hand_text_label = tk.Label(self.player_hand_frame, text="")
+        self.hand_text_label.pack(side=tk.TOP, pady=5)
+        hand_cards_frame = tk.Frame(self.player_hand_frame)
+        hand_cards_frame.pack(side=tk.TOP)
+        self.hand_slots = [tk.Label(hand_cards_frame) for _ in range(2)]
+        self.hand_shown = [None] * len(self.hand_slots)
+
+        self.community_text_label = tk.Label(self.community_frame, text="")
+        self.community_text_label.pack(side=tk.TOP, pady=5)
+        community_cards_frame = tk.Frame(self.community_frame)
+        community_cards_frame.pack(side=tk.TOP)
+        self.community_slots = [tk.Label(community_cards_frame) for _ in range(5)]
+        self.community_shown = [None] * len(self.community_slots)
+
+        self.shown_text = {}
+
+    def set_label_text(self, label, text):
+        if self.shown_text.get(label) != text:
+            self.shown_text[label] = text
+            label.config(text=text)
+
+    def show_cards(self, slots, shown, cards):
+        for column, slot in enumerate(slots):
+            card = cards[column] if column < len(cards) else None
+            if shown[column] is card:
+                continue
+            shown[column] = card
+            if card is None:
+                slot.grid_remove()
+            else:
+                suit_name = self.SUIT_MAPPING.get(card._suit, card._suit)
+                # Keep a reference so an LRU eviction cannot blank a card still on screen
+                slot.image = self.card_images[f"{card._face}_of_{suit_name}"]
+                slot.config(image=slot.image)
+                slot.grid(row=0, column=column)
 
+    def update_community_cards_display(self):
         # Label for the community cards
-        community_hand_text = ", ".join([str(card) for card in game.community_cards])
-        community_cards_label = tk.Label(self.community_frame, text=f"Community Cards: {community_hand_text}")
-        community_cards_label.pack(side=tk.TOP)
-
-        for card in self.game.community_cards:
-            suit_name = self.SUIT_MAPPING.get(card._suit, card._suit)
-            tk.Label(self.community_frame, image=self.card_images[f"{card._face}_of_{suit_name}"]).pack(side=tk.LEFT)
+        community_hand_text = ", ".join([str(card) for card in self.view.community_cards])
+        self.set_label_text(self.community_text_label, f"Community Cards: {community_hand_text}")
+        self.show_cards(self.community_slots, self.community_shown, self.view.community_cards)
 
     def update_hand_display(self):
-        # Clear the current hand frames
-        for element in self.player_hand_frame.winfo_children():
-            element.destroy()
-
-        for element in self.community_frame.winfo_children():
-            element.destroy()
-
-        player1_frame = tk.Frame(self.player_hand_frame)
-        player1_frame.pack(side=tk.TOP, pady=5)  # Adjust pady as needed
-
-        community_frame = tk.Frame(self.community_frame)
-        community_frame.pack(side=tk.TOP, pady=5)
-
-        player_hand_text = ", ".join([str(card) for card in self.game.players[game.current_player_index]['hand']])
-        player_hand_label = tk.Label(player1_frame, text=f"{game.get_player_by_name(game.get_active_players()[game.current_player_index])['name']}'s Hand: {player_hand_text}")
-        player_hand_label.pack(side=tk.TOP)
-
-        # Label for the community cards
-        community_hand_text = ", ".join([str(card) for card in self.game.community_cards])
-        community_cards_label = tk.Label(community_frame, text=f"Community Cards: {community_hand_text}")
-        community_cards_label.pack(side=tk.TOP)
+        # current_player_index counts active players, not seats
+        player = self.current_player()
+        hand = player['hand']
+        player_hand_text = ", ".join([str(card) for card in hand])
+        self.set_label_text(self.hand_text_label, f"{player['name']}'s Hand: {player_hand_text}")
+        self.show_cards(self.hand_slots, self.hand_shown, hand)
 
-        # Show images for the second player
-        for card in self.game.players[game.current_player_index]['hand']:  # Assuming the second player is the second in the list
-            suit_name = self.SUIT_MAPPING.get(card._suit, card._suit)
-            tk.Label(player1_frame, image=self.card_images[f"{card._face}_of_{suit_name}"]).pack(side=tk.LEFT)
-
-        # Show images for the community cards
-        for card in self.game.community_cards:
-            suit_name = self.SUIT_MAPPING.get(card._suit, card._suit)
-            tk.Label(self.community_frame, image=self.card_images[f"{card._face}_of_{suit_name}"]).pack(side=tk.LEFT)
+        self.update_community_cards_display()
 
     def get_coordinates(self, widget):
         x = widget.winfo_x()
@@ -889,68 +984,71 @@ class PokerGameGUI:
         return x, y
 
     def update_tokens_display(self):
-        self.canvas.delete("all")        
-
-        total = game.get_money(game.get_player_by_name(game.get_active_players()[game.current_player_index])['name'])
-
-        money = {'1000': 0, '500': 0, '100': 0, '50': 0, '10': 0, '5': 0}
-
-        if total/1000 >= 1: 
-            money['1000'] = int(total/1000)
-            total = total % 1000
-        if total/500 >= 1: 
-            money['500'] = int(total/500)
-            total = total % 500
-        if total/100 >= 1:
-            money['100'] = int(total/100)
-            total = total % 100
-        if total/50 >= 1:
-            money['50'] = int(total/50)
-            total = total % 50
-        if total/10 >= 1:
-            money['10'] = int(total/10)
-            total = total % 10
-        if total/5 >= 1:
-            money['5'] = int(total/5)
-            total = total % 5
-
-        token_width = 120
-        token_height = 120
-
-        
-        count = 0
-        for key, value in money.items(): 
-            if value != 0: 
-                count += 1
-                
-        parent_x = parent_y = 0
-        x_offset = 400 - 120*count/2# Adjust this value to position the tokens horizontally
-        y_offset = parent_y # Adjust this value to position the tokens vertically
-
-        for key, value in money.items():
-            if value != 0: 
-                y_pos = y_offset # 0
-                x_pos = x_offset # -260
-                
-                # x_pos = 400 - 120*count/2
-                print(key, value, x_pos)
-                
-                for i in range(value):
-                    img = self.token_images.get(f"{key}")  
-                    
-                    self.canvas.create_image(x_pos, y_pos, anchor=tk.NW, image=img)
-                    y_pos += token_height/10  # Increment y_pos for the next token value
-
-                x_pos += token_width + 10  # Increment x_pos for each token of the same value
-                x_offset += token_width + 10  # Increment x_offset for the next token value
-
-    def deal_initial_cards(self):
-        for player in game.players: 
-            self.game.deal_hands(player,num_cards=2)
+        total = self.current_player()['money']
+        layout = chip_layout(int(total))
+        if layout == self.shown_chip_layout:
+            return
+        self.shown_chip_layout = layout
+
+        draws = []
+        for key, count, x in layout:
+            if count > self.CHIP_COLLAPSE:
+                draws.append((x, 0, self.token_images.stack(key, count, self.CHIP_STEP)))
+            else:
+                image = self.token_images[key]
+                draws.extend((x, i * self.CHIP_STEP, image) for i in range(count))
+        # Referenced here too, so a sprite cache eviction cannot blank a shown chip
+        self.shown_chip_images = [image for _, _, image in draws]
+
+        # Move and retexture the items already on the canvas, create only what is missing
+        for i, (x, y, image) in enumerate(draws):
+            if i < len(self.chip_items):
+                self.canvas.coords(self.chip_items[i], x, y)
+                self.canvas.itemconfig(self.chip_items[i], image=image, state=tk.NORMAL)
+            else:
+                self.chip_items.append(self.canvas.create_image(x, y, anchor=tk.NW, image=image))
+        for item in self.chip_items[len(draws):]:
+            self.canvas.itemconfig(item, state=tk.HIDDEN)
+
+def instrumented(gui=True):
+    # Methods to time with instrument.enable(instrumented()), see instrument.py
+    targets = [(PokerGame, ('showdown_strengths', 'determine_winner', 'betting_round'))]
+    if gui:
+        load_gui()
+        targets.append((PokerGameGUI, ('update_hand_display', 'update_community_cards_display',
+                                       'update_tokens_display', 'update_bets_and_pot', 'update_equity_display')))
+        targets.append((LazySprites, ('_image', 'stack')))  # image decoding and stack compositing
+    return targets
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play poker in a Tk window")
+    parser.add_argument('--threaded', action='store_true', help="run the game engine on a worker thread")
+    parser.add_argument('--stats', metavar='PATH', help="time the hot paths and keep writing the stats to PATH")
+    parser.add_argument('--stats-interval', type=float, default=5.0, help="seconds between stats dumps")
+    parser.add_argument('--profile', metavar='PATH', help="run under cProfile and write pstats output to PATH")
+    args = parser.parse_args()
+
+    if args.stats:
+        import instrument
+        instrument.enable(instrumented())
+        instrument.start_periodic_dump(args.stats, args.stats_interval)
+
     game = PokerGame()
     game.add_player('Player1')
     game.add_player('Player2')
-    gui = PokerGameGUI(game)
-    gui.run()
\ No newline at end of file
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        gui = PokerGameGUI(game, threaded=args.threaded)
+        gui.run()
+    finally:
+        if args.profile:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        if args.stats:
+            instrument.stop_periodic_dump()
+            instrument.dump(args.stats)
\ No newline at end of file
@@ -0,0 +1,127 @@
+import argparse
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from cards import CARDS
+from equity import equity
+
+# Precomputed preflop equities for the 169 starting-hand classes.
+#
+# Classes follow the usual 13x13 grid with aces first: class = row * 13 + col,
+# where row/col are 12 - rank. The diagonal holds the pairs, above it (row < col)
+# the suited hands and below it the offsuit ones.
+#
+# File layout (little endian): a 16-byte header
+#   magic b'PFEQ' | version u16 | min players u8 | max players u8 |
+#   classes u16 | reserved u16 | iterations u32
+# followed by float32 equities, one row of 169 per table size. The file is
+# mapped, so a lookup reads a single float and only the touched page is loaded.
+
+MAGIC = b'PFEQ'
+VERSION = 1
+HEADER = struct.Struct('<4sHBBHHI')
+NUM_CLASSES = 169
+MIN_PLAYERS, MAX_PLAYERS = 2, 9  # same range add_player_dialog accepts
+DEFAULT_ITERATIONS = 20000
+CLASS_FACES = '23456789TJQKA'
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'preflop_equity.bin')
+
+
+def hand_class(card1, card2):
+    high, low = max(card1.rank, card2.rank), min(card1.rank, card2.rank)
+    if high == low or card1.suit != card2.suit:
+        return (12 - low) * 13 + (12 - high)
+    return (12 - high) * 13 + (12 - low)
+
+
+def class_name(index):
+    row, col = divmod(index, 13)
+    if row == col:
+        return CLASS_FACES[12 - row] * 2
+    if row < col:
+        return CLASS_FACES[12 - row] + CLASS_FACES[12 - col] + 's'
+    return CLASS_FACES[12 - col] + CLASS_FACES[12 - row] + 'o'
+
+
+def class_cards(index):
+    # One representative hand for the class (spades, plus clubs when not suited)
+    row, col = divmod(index, 13)
+    high, low = 12 - min(row, col), 12 - max(row, col)
+    second_suit = 0 if row < col else 1
+    return [CARDS[high * 4], CARDS[low * 4 + second_suit]]
+
+
+def _equity_job(args):
+    index, players, iterations = args
+    result = equity(class_cards(index), num_opponents=players - 1, iterations=iterations,
+                    seed=players * NUM_CLASSES + index)
+    return result['equity']
+
+
+def generate(path=DEFAULT_PATH, iterations=DEFAULT_ITERATIONS, workers=None):
+    jobs = [(index, players, iterations)
+            for players in range(MIN_PLAYERS, MAX_PLAYERS + 1) for index in range(NUM_CLASSES)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        equities = list(pool.map(_equity_job, jobs, chunksize=8))
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, MIN_PLAYERS, MAX_PLAYERS, NUM_CLASSES, 0, iterations))
+        f.write(struct.pack(f'<{len(equities)}f', *equities))
+    return path
+
+
+class PreflopTable:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._map = None
+
+    def _open(self):
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.min_players, self.max_players, classes, _, self.iterations = \
+            HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or classes != NUM_CLASSES:
+            self.close()
+            raise ValueError(f"{self.path} is not a preflop equity table")
+        expected = HEADER.size + 4 * NUM_CLASSES * (self.max_players - self.min_players + 1)
+        if len(self._map) < expected:
+            self.close()
+            raise ValueError(f"{self.path} is truncated")
+
+    def class_equity(self, index, num_players):
+        if self._map is None:
+            self._open()
+        if not self.min_players <= num_players <= self.max_players:
+            raise ValueError(f"num_players must be between {self.min_players} and {self.max_players}")
+        offset = HEADER.size + 4 * ((num_players - self.min_players) * NUM_CLASSES + index)
+        return struct.unpack_from('<f', self._map, offset)[0]
+
+    def lookup(self, hole_cards, num_players):
+        return self.class_equity(hand_class(*hole_cards), num_players)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+_default_table = None
+
+
+def preflop_equity(hole_cards, num_players):
+    # Equity of hole_cards at a table of num_players, from the default table file
+    global _default_table
+    if _default_table is None:
+        _default_table = PreflopTable()
+    return _default_table.lookup(hole_cards, num_players)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the preflop equity table")
+    parser.add_argument('--out', default=DEFAULT_PATH)
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    print(generate(args.out, args.iterations, args.workers))
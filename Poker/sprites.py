@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+# Pre-scaled sprite sheets for the card and chip images.
+#
+# Decoding dozens of PNGs and running a LANCZOS resize on each dominates a cold
+# start, so the scaled images are packed once into a single sheet per source
+# directory and target size, next to a JSON index of where each one sits. The
+# index also records every source file's mtime and size; if any of them (or the
+# target size) change, the sheet is rebuilt on the next launch.
+#
+# LazySprites is what the GUI holds: nothing is decoded until an image is first
+# shown, and only a bounded number of PhotoImages are kept alive.
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sprite_cache')
+INDEX_VERSION = 1
+SHEET_COLUMNS = 13
+
+
+def _signature(paths, size):
+    files = {}
+    for name, path in paths.items():
+        stat = os.stat(path)
+        files[name] = [stat.st_mtime_ns, stat.st_size]
+    return {'version': INDEX_VERSION, 'size': list(size), 'files': files}
+
+
+def _cache_paths(source_dir, size, cache_dir):
+    # The path hash keeps same-named asset directories (e.g. per theme) apart
+    source_dir = os.path.abspath(source_dir)
+    digest = hashlib.sha1(source_dir.encode('utf-8')).hexdigest()[:8]
+    tag = f'{os.path.basename(source_dir)}_{digest}_{size[0]}x{size[1]}'
+    return os.path.join(cache_dir, tag + '.png'), os.path.join(cache_dir, tag + '.json')
+
+
+def _read_index(index_path, signature):
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+        return index if index['signature'] == signature else None
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _load_cached(sheet_path, index_path, signature):
+    index = _read_index(index_path, signature)
+    if index is None:
+        return None
+    try:
+        sheet = Image.open(sheet_path)
+        sheet.load()
+        return {name: sheet.crop(tuple(box)) for name, box in index['boxes'].items()}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _build(paths, size, sheet_path, index_path, signature):
+    width, height = size
+    columns = min(len(paths), SHEET_COLUMNS)
+    rows = -(-len(paths) // columns)
+    sheet = Image.new('RGBA', (columns * width, rows * height))
+    boxes = {}
+    images = {}
+    for position, (name, path) in enumerate(paths.items()):
+        image = Image.open(path).convert('RGBA').resize(size, Image.LANCZOS)
+        x, y = (position % columns) * width, (position // columns) * height
+        sheet.paste(image, (x, y))
+        boxes[name] = [x, y, x + width, y + height]
+        images[name] = image
+
+    try:
+        os.makedirs(os.path.dirname(sheet_path), exist_ok=True)
+        sheet.save(sheet_path)
+        with open(index_path, 'w') as f:
+            json.dump({'signature': signature, 'boxes': boxes}, f)
+    except OSError:
+        pass  # read-only install: still usable, just not cached
+    return images
+
+
+class LazySprites:
+    # Dict-like {name: PhotoImage} that decodes an image the first time it is
+    # looked up and keeps at most `capacity` PhotoImages, least recently used
+    # out first. One instance per source directory and size, so extra sizes or
+    # themes each stay bounded. Tk drops an image once its PhotoImage is
+    # collected, so capacity must exceed the number of images shown at once.
+    def __init__(self, source_dir, names, size, capacity=32, cache_dir=CACHE_DIR):
+        self.source_dir = source_dir
+        self.names = frozenset(names)
+        self.size = tuple(size)
+        self.capacity = capacity
+        self._paths = {name: os.path.join(source_dir, f'{name}.png') for name in names}
+        self._sheet_path, self._index_path = _cache_paths(source_dir, self.size, cache_dir)
+        self._photos = OrderedDict()
+        self._stacks = OrderedDict()  # (name, count, step) -> PhotoImage of a whole column
+        self._sheet = None  # cropped images from a valid cached sheet, once checked
+        self._checked = False
+
+    def _image(self, name):
+        if not self._checked:
+            self._checked = True
+            self._sheet = _load_cached(self._sheet_path, self._index_path, _signature(self._paths, self.size))
+        if self._sheet is not None:
+            return self._sheet[name]
+        return Image.open(self._paths[name]).convert('RGBA').resize(self.size, Image.LANCZOS)
+
+    def __getitem__(self, name):
+        photo = self._photos.get(name)
+        if photo is not None:
+            self._photos.move_to_end(name)
+            return photo
+        if name not in self.names:
+            raise KeyError(name)
+        photo = self._photos[name] = ImageTk.PhotoImage(self._image(name))
+        if len(self._photos) > self.capacity:
+            self._photos.popitem(last=False)
+        return photo
+
+    def stack(self, name, count, step):
+        # One PhotoImage of `count` copies of name, each `step` pixels below the
+        # last, so a tall column is a single canvas item. Bounded like the rest.
+        key = (name, count, step)
+        photo = self._stacks.get(key)
+        if photo is not None:
+            self._stacks.move_to_end(key)
+            return photo
+        if name not in self.names:
+            raise KeyError(name)
+        image = self._image(name).convert('RGBA')
+        column = Image.new('RGBA', (image.width, image.height + step * (count - 1)))
+        for i in range(count):
+            column.alpha_composite(image, (0, i * step))
+        photo = self._stacks[key] = ImageTk.PhotoImage(column)
+        if len(self._stacks) > self.capacity:
+            self._stacks.popitem(last=False)
+        return photo
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def refresh_cache(self):
+        # Rebuild the sheet if it is missing or stale so the next launch can use it
+        signature = _signature(self._paths, self.size)
+        if _read_index(self._index_path, signature) is None or not os.path.exists(self._sheet_path):
+            _build(self._paths, self.size, self._sheet_path, self._index_path, signature)
@@ -1,63 +1,9 @@
-import random
-from collections import Counter
 import tkinter as tk
 from tkinter import messagebox
 from PIL import Image, ImageTk
 import os
-
-class Card:
-    ACE, JACK, QUEEN, KING = 'A', 'J', 'Q', 'K'
-    FACES = (ACE, '2', '3', '4', '5', '6', '7', '8', '9', '10', JACK, QUEEN, KING)
-    SUITS = tuple(map(chr, (9824, 9827, 9829, 9830)))
-    SPADE, CLUB, HEART, DIAMOND = SUITS  # ♠ ♣ ♥ ♦
-
-    def __init__(self, suit, face):
-        self._suit = suit
-        self._face = face
-
-    def __int__(self):
-        if self._face == Card.JACK:
-            return 11
-        if self._face == Card.QUEEN:
-            return 12
-        if self._face == Card.KING:
-            return 13
-
-        return 1 if self._face == Card.ACE else int(self._face)
-
-    def __str__(self):
-        return self._suit + str(self._face)
-
-    def __repr__(self):
-        return __class__.__name__ + repr((self._suit, self._face))
-
-class Deck:
-    def __init__(self):
-        self._deck = [Card(suit, face) for suit in Card.SUITS for face in Card.FACES]
-
-    def show(self):
-        return self._deck
-
-    def shuffle(self):
-        random.shuffle(self._deck)
-
-    def __iter__(self):
-        return iter(self._deck)
-
-    def draw_cards(self, num_cards=1):
-        if num_cards > len(self._deck):
-            raise ValueError("Not enough cards in the deck")
-
-        drawn_indices = random.sample(range(len(self._deck)), num_cards)
-        drawn_cards = [self._deck.pop(i) for i in sorted(drawn_indices, reverse=True)]
-
-        return drawn_cards
-
-    def create_deck():
-        suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
-        deck = [Card(suit, rank) for suit in suits for rank in ranks]
-        return deck
+from cards import Card, Deck
+from evaluator import evaluate, hand_name, hand_ranks
 
 class PokerGame:
     HAND_RANKINGS = ["Royal Flush", "Straight Flush", "Four of a Kind", "Full House", "Flush", "Straight",
@@ -121,53 +67,12 @@ class PokerGame:
         return self.current_player_index
     
     def evaluate_hand(self, private_cards, community_cards):
-        all_cards = private_cards + community_cards
-
-        values = [card.__int__() for card in all_cards]
-        suits = [card._suit for card in all_cards]
+        strength = self.hand_strength(private_cards, community_cards)
+        return hand_name(strength), hand_ranks(strength)
 
-        # Count occurrences of each value and suit
-        value_counts = Counter(values)
-        suit_counts = Counter(suits)
-
-        # Check for flush
-        is_flush = any(count >= 5 for count in suit_counts.values())
-        flush_suit = [suit for suit, count in suit_counts.items() if count >= 5]
-
-        # Check for straight
-        sorted_values = sorted(set(values))
-        is_straight = any(sorted_values[i:i+5] == list(range(sorted_values[i], sorted_values[i]+5))
-                        for i in range(len(sorted_values) - 4))
-
-        if is_straight and is_flush:
-            if 14 in sorted_values:
-                return "Royal Flush", flush_suit[0]
-            else:
-                return "Straight Flush", flush_suit[0]
-        elif 4 in value_counts.values():
-            return "Four of a Kind", max(value_counts, key=value_counts.get)
-        elif 3 in value_counts.values() and 2 in value_counts.values():
-            three_of_a_kind=''
-            two_of_a_kind=''
-            for key, value in value_counts.items():
-                if value == 2:
-                    two_of_a_kind=key
-                elif value==3:
-                    three_of_a_kind=key
-            return "Full House", [three_of_a_kind, two_of_a_kind]
-        elif is_flush:
-            return "Flush", flush_suit[0]
-        elif is_straight:
-            return "Straight", None
-        elif 3 in value_counts.values():
-            return "Three of a Kind", max(value_counts, key=value_counts.get)
-        elif list(value_counts.values()).count(2) >= 2:
-            pairs = [value for value, count in value_counts.items() if count == 2]
-            return "Two Pairs", pairs
-        elif list(value_counts.values()).count(2) == 1:
-            return "One Pair", max(value_counts, key=value_counts.get)
-        else:
-            return "High Card", max(values) 
+    def hand_strength(self, private_cards, community_cards):
+        # One comparable integer per hand, kickers included (higher wins)
+        return evaluate(private_cards + community_cards)
 
     def deal_hands(self, num_cards=2):
         for player in self.players:
@@ -449,7 +354,7 @@ class PokerGameGUI:
         if result:
             self.set_round(1)
             game.community_cards = []
-            game.deck = Deck()
+            game.deck.reset()
             
             self.deal_initial_cards()
             self.call_button.config(state=tk.NORMAL)